@@ -1,4 +1,4 @@
-from .subclass import argumented_subclass, attributed_subclass
+from .subclass import argumented_subclass, attributed_subclass, interned, SubclassCache
 from .descriptors import (
     ArgumentedSubclass, AttributedSubclass, AutoProperty,
     DummySubclass, FactoryProperty
@@ -6,7 +6,7 @@ from .descriptors import (
 
 
 __all__ = (
-    'argumented_subclass', 'attributed_subclass',
+    'argumented_subclass', 'attributed_subclass', 'interned', 'SubclassCache',
     'ArgumentedSubclass', 'AttributedSubclass', 'AutoProperty',
     'DummySubclass', 'FactoryProperty',
 )
@@ -0,0 +1,216 @@
+"""
+Benchmarks for ``classical``.
+
+Run them with::
+
+    python -m classical.bench --output results.json
+    python -m classical.bench --baseline results.json --threshold 0.1
+
+"""
+
+import gc
+import json
+import platform
+import re
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+
+# A benchmark is a function that prepares everything
+# and returns the callable to be measured
+BenchmarkSetup = Callable[[], Callable[[], Any]]
+
+BENCHMARK_REGISTRY = {}  # type: Dict[str, BenchmarkSetup]
+
+
+def benchmark(name: str) -> Callable[[BenchmarkSetup], BenchmarkSetup]:
+    """
+    Register a benchmark setup function under ``name``
+    """
+    def decorator(setup: BenchmarkSetup) -> BenchmarkSetup:
+        BENCHMARK_REGISTRY[name] = setup
+        return setup
+
+    return decorator
+
+
+BenchmarkResult = NamedTuple('BenchmarkResult', (
+    ('ops_per_sec', float),
+    ('peak_bytes', int),
+    ('retained_bytes_per_op', float),
+    ('allocated_bytes_per_op', float),
+))
+BenchmarkResult.__new__.__defaults__ = (0.0,)  # results saved before the metric was added
+
+# Maximum number of calls measured one by one for allocations
+ALLOCATION_SAMPLE_SIZE = 1000
+
+# Changes of memory metrics below these values are ignored as noise
+_NOISE_BYTES = {
+    'peak_bytes': 1024,
+    'retained_bytes_per_op': 64,
+    'allocated_bytes_per_op': 64,
+}
+
+Regression = NamedTuple('Regression', (
+    ('name', str),
+    ('metric', str),
+    ('baseline', float),
+    ('current', float),
+))
+
+
+def _time_ops(func: Callable[[], Any], number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - start
+
+
+def _measure_allocations(func: Callable[[], Any], number: int) -> float:
+    """
+    Return the average peak of memory allocated during a single call of ``func``.
+    Unlike retained memory, it includes temporary objects freed before the call returns.
+    """
+    total = 0
+    for _ in range(number):
+        # tracing starts from scratch, so the peak only counts the call's own allocations
+        tracemalloc.start()
+        try:
+            func()
+            _, peak_size = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        total += peak_size
+    return total / number
+
+
+def measure(func: Callable[[], Any], number: int = 10000, repeat: int = 5) -> BenchmarkResult:
+    """
+    Measure speed and memory usage of ``func``.
+
+    :param func: callable without arguments
+    :param number: number of calls per timing
+    :param repeat: number of timings, the best one is used
+    :return: ops/sec, peak memory of ``number`` calls, memory retained per call
+        and memory allocated per call (at its peak)
+    """
+    func()  # warm up caches
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        best_time = min(_time_ops(func, number) for _ in range(repeat))
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    try:
+        start_size, _ = tracemalloc.get_traced_memory()
+        for _ in range(number):
+            func()
+        end_size, peak_size = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        ops_per_sec=number / best_time if best_time else float('inf'),
+        peak_bytes=max(peak_size - start_size, 0),
+        retained_bytes_per_op=max(end_size - start_size, 0) / number,
+        allocated_bytes_per_op=_measure_allocations(func, min(number, ALLOCATION_SAMPLE_SIZE)),
+    )
+
+
+def run_benchmarks(
+        pattern: Optional[str] = None,
+        number: int = 10000, repeat: int = 5,
+        report: Optional[Callable[[str, BenchmarkResult], None]] = None,
+) -> Dict[str, BenchmarkResult]:
+    """
+    Run registered benchmarks.
+
+    :param pattern: regular expression to select benchmarks by name
+    :param number: number of calls per timing
+    :param repeat: number of timings
+    :param report: called with the name and result after each benchmark
+    :return: dict of benchmark name -> result
+    """
+    from classical.bench import cases  # noqa, registers the benchmarks
+
+    results = {}  # type: Dict[str, BenchmarkResult]
+    for name, setup in sorted(BENCHMARK_REGISTRY.items()):
+        if pattern is not None and not re.search(pattern, name):
+            continue
+        try:
+            func = setup()
+        except ImportError:  # optional backend is not installed
+            continue
+        results[name] = measure(func, number=number, repeat=repeat)
+        if report is not None:
+            report(name, results[name])
+    return results
+
+
+def save_results(results: Dict[str, BenchmarkResult], path: str) -> None:
+    """
+    Save benchmark results to a JSON file
+    """
+    data = {
+        'meta': {
+            'python': sys.version,
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+        },
+        'results': {name: result._asdict() for name, result in results.items()},
+    }
+    with open(path, 'w') as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+
+
+def load_results(path: str) -> Dict[str, BenchmarkResult]:
+    """
+    Load benchmark results saved by :func:`~classical.bench.save_results`
+    """
+    with open(path) as file:
+        data = json.load(file)
+    return {name: BenchmarkResult(**result) for name, result in data['results'].items()}
+
+
+def compare_results(
+        results: Dict[str, BenchmarkResult],
+        baseline: Dict[str, BenchmarkResult],
+        threshold: float = 0.1,
+) -> List[Regression]:
+    """
+    Find benchmarks that became slower or use more memory than in ``baseline``.
+
+    :param results: current results
+    :param baseline: baseline results
+    :param threshold: allowed relative degradation (``0.1`` is 10%)
+    :return: list of regressions
+    """
+    regressions = []  # type: List[Regression]
+    for name, result in sorted(results.items()):
+        base = baseline.get(name)
+        if base is None:
+            continue
+        if result.ops_per_sec < base.ops_per_sec * (1 - threshold):
+            regressions.append(Regression(name, 'ops_per_sec', base.ops_per_sec, result.ops_per_sec))
+        for metric, noise in sorted(_NOISE_BYTES.items()):
+            base_value, value = getattr(base, metric), getattr(result, metric)
+            if value > base_value * (1 + threshold) and value - base_value > noise:
+                regressions.append(Regression(name, metric, base_value, value))
+    return regressions
+
+
+def format_result(name: str, result: BenchmarkResult) -> str:
+    return '{:<45} {:>14,.0f} ops/s {:>12,} B peak {:>10,.1f} B/op retained {:>10,.1f} B/op allocated'.format(
+        name, result.ops_per_sec, result.peak_bytes, result.retained_bytes_per_op, result.allocated_bytes_per_op)
+
+
+def format_regression(regression: Regression) -> str:
+    change = (regression.current - regression.baseline) / regression.baseline if regression.baseline else 0
+    return '{:<45} {}: {:,.1f} -> {:,.1f} ({:+.1%})'.format(
+        regression.name, regression.metric, regression.baseline, regression.current, change)
@@ -0,0 +1,43 @@
+import argparse
+import sys
+from typing import List, Optional
+
+from classical.bench import (
+    compare_results, format_regression, format_result,
+    load_results, run_benchmarks, save_results,
+)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m classical.bench', description='Run classical benchmarks')
+    parser.add_argument('-k', '--filter', help='regular expression to select benchmarks by name')
+    parser.add_argument('-n', '--number', type=int, default=10000, help='number of calls per timing')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='number of timings')
+    parser.add_argument('-o', '--output', help='save results to this JSON file')
+    parser.add_argument('-b', '--baseline', help='compare results with this JSON file')
+    parser.add_argument(
+        '-t', '--threshold', type=float, default=0.1,
+        help='allowed relative degradation compared to the baseline (default: 0.1)')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        pattern=args.filter, number=args.number, repeat=args.repeat,
+        report=lambda name, result: print(format_result(name, result)),
+    )
+    if args.output:
+        save_results(results, args.output)
+
+    if args.baseline:
+        regressions = compare_results(results, load_results(args.baseline), threshold=args.threshold)
+        if regressions:
+            print('\nRegressions:')
+            for regression in regressions:
+                print(format_regression(regression))
+            return 1
+        print('\nNo regressions')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
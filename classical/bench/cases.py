@@ -0,0 +1,148 @@
+"""
+Benchmark definitions
+"""
+
+from collections import namedtuple
+from typing import Any, Callable, Dict, Tuple
+
+from classical.bench import benchmark
+from classical.descriptors import ArgumentedSubclass, AutoProperty
+from classical.fields.functions import are_analogous, copy_to_class, diff, get_fields, get_name_dict
+from classical.subclass import argumented_subclass
+
+
+_FIELD_NAMES = ('color', 'size', 'weight', 'shape', 'material')
+_VALUES = {'color': 'red', 'size': 2, 'weight': 34.56, 'shape': 'round', 'material': 'wood'}
+
+
+def _make_namedtuple() -> Tuple[type, Any]:
+    cls = namedtuple('FieldedNT', _FIELD_NAMES)
+    return cls, cls(**_VALUES)
+
+
+def _make_dict() -> Tuple[type, Any]:
+    return dict, dict(_VALUES)
+
+
+def _make_attrs() -> Tuple[type, Any]:
+    import attr
+
+    cls = attr.make_class('FieldedAttrs', list(_FIELD_NAMES))
+    return cls, cls(**_VALUES)
+
+
+def _make_dataclass() -> Tuple[type, Any]:
+    import dataclasses
+
+    cls = dataclasses.make_dataclass('FieldedDataclass', _FIELD_NAMES)
+    return cls, cls(**_VALUES)
+
+
+def _make_schematics() -> Tuple[type, Any]:
+    import schematics
+
+    cls = type('FieldedModel', (schematics.Model,), {
+        name: schematics.types.BaseType() for name in _FIELD_NAMES
+    })
+    return cls, cls(_VALUES)
+
+
+def _make_sqlalchemy() -> Tuple[type, Any]:
+    import sqlalchemy
+    import sqlalchemy.orm
+
+    namespace = {
+        name: sqlalchemy.Column(sqlalchemy.String, primary_key=name == 'color')
+        for name in _FIELD_NAMES
+    }  # type: Dict[str, Any]
+    namespace['__tablename__'] = 'fielded'
+    cls = type('FieldedModel', (sqlalchemy.orm.declarative_base(),), namespace)
+    return cls, cls(**_VALUES)
+
+
+BACKENDS = {
+    'namedtuple': _make_namedtuple,
+    'dict': _make_dict,
+    'attrs': _make_attrs,
+    'dataclass': _make_dataclass,
+    'schematics': _make_schematics,
+    'sqlalchemy': _make_sqlalchemy,
+}  # type: Dict[str, Callable[[], Tuple[type, Any]]]
+
+
+def _register_field_benchmarks(backend: str, make: Callable[[], Tuple[type, Any]]) -> None:
+    @benchmark('fields.get_fields.{}'.format(backend))
+    def bench_get_fields() -> Callable[[], Any]:
+        cls, _ = make()
+        return lambda: get_fields(cls)
+
+    @benchmark('fields.get_name_dict.{}'.format(backend))
+    def bench_get_name_dict() -> Callable[[], Any]:
+        _, obj = make()
+        return lambda: get_name_dict(obj)
+
+    @benchmark('fields.copy_to_class.{}_to_attrs'.format(backend))
+    def bench_copy_to_class() -> Callable[[], Any]:
+        _, obj = make()
+        dst_cls, _ = _make_attrs()
+        return lambda: copy_to_class(obj, dst_cls)
+
+
+for _backend, _make in BACKENDS.items():
+    _register_field_benchmarks(_backend, _make)
+
+
+@benchmark('fields.are_analogous')
+def bench_are_analogous() -> Callable[[], Any]:
+    objs = [make()[1] for make in (_make_namedtuple, _make_attrs, _make_dataclass)] * 10
+    return lambda: are_analogous(*objs)
+
+
+@benchmark('fields.diff.namedtuple_to_attrs')
+def bench_diff() -> Callable[[], Any]:
+    a, b = _make_namedtuple()[1], _make_attrs()[1]
+    return lambda: diff(a, b)
+
+
+class _Thing:
+    Red = ArgumentedSubclass(color='red')
+    book = AutoProperty(has='pages')
+
+    def __init__(self, color=None, has=None):
+        self.color = color
+        self.has = has
+
+
+@benchmark('descriptors.factory_property.hot')
+def bench_factory_property_hot() -> Callable[[], Any]:
+    _Thing.Red  # noqa, create the subclass
+    return lambda: _Thing.Red
+
+
+@benchmark('descriptors.factory_property.cold')
+def bench_factory_property_cold() -> Callable[[], Any]:
+    prop = _Thing.__dict__['book']
+
+    def get_cold():
+        prop.invalidate(_Thing)
+        return _Thing.book
+
+    return get_cold
+
+
+@benchmark('subclass.argumented_subclass.init')
+def bench_argumented_init() -> Callable[[], Any]:
+    return argumented_subclass(_Thing, 'Red', color='red')
+
+
+@benchmark('subclass.argumented_subclass.init_chain')
+def bench_argumented_init_chain() -> Callable[[], Any]:
+    chained = _Thing
+    for level in range(3):
+        chained = argumented_subclass(chained, 'Level{}'.format(level), has='level')
+    return chained
+
+
+@benchmark('subclass.argumented_subclass.create')
+def bench_argumented_create() -> Callable[[], Any]:
+    return lambda: argumented_subclass(_Thing, 'Red', color='red')
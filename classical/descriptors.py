@@ -2,12 +2,110 @@
 Descriptors/properties for classes
 """
 
+import collections
 import copy
-from typing import Optional, Tuple
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional, Tuple
 
+from . import metrics
 from .subclass import argumented_subclass, attributed_subclass
 
 
+EVICTION_LRU = 'lru'
+EVICTION_FIFO = 'fifo'
+
+_EVICTION_OPTIONS = (EVICTION_LRU, EVICTION_FIFO)
+
+# Name of the owner class attribute that stores objects created for it
+# (also used literally in ``FactoryProperty.__get__``)
+_OWNER_STORAGE_ATTR = '__classical_factory_cache__'
+
+_MISSING = object()
+
+_EMPTY_STORAGE = {}  # type: Dict[Any, Tuple[type, Any]]
+
+
+class _OwnerMap:
+    """
+    Mapping of owner classes to the objects created for them.
+
+    The objects are stored in the owner's own ``__dict__``
+    and the map references the owners weakly, so an owner and its objects
+    are garbage-collected together. A ``WeakKeyDictionary`` would not work here
+    because the created subclasses and instances reference their owner,
+    so its values would keep the keys alive forever.
+
+    The storage maps the map to an ``(owner, object)`` pair,
+    so that it can be looked up with a plain (inherited) attribute access:
+    storage inherited from a base class holds pairs of another owner.
+    """
+
+    def __init__(self, max_size: Optional[int] = None, eviction: str = EVICTION_LRU):
+        if eviction not in _EVICTION_OPTIONS:
+            raise ValueError('Invalid eviction value: {!r}, must be one of {}'.format(
+                eviction, _EVICTION_OPTIONS))
+        if max_size is not None and max_size < 1:
+            raise ValueError('max_size must be positive')
+        self.max_size = max_size
+        self.eviction = eviction
+        # whether accesses have to be recorded (see ``touch``)
+        self.tracks_access = max_size is not None and eviction == EVICTION_LRU
+        # weak references to owners in the order of insertion (or last access)
+        self._owner_refs = collections.OrderedDict()  # type: collections.OrderedDict
+
+    def __len__(self) -> int:
+        return len(self._owner_refs)
+
+    def _forget_ref(self, owner_ref: weakref.ref) -> None:
+        self._owner_refs.pop(owner_ref, None)
+
+    def touch(self, owner: type) -> None:
+        """
+        Mark the owner's object as the most recently used one
+        """
+        try:
+            self._owner_refs.move_to_end(weakref.ref(owner))
+        except KeyError:  # evicted by another thread
+            pass
+
+    def get(self, owner: type, default: Any = None) -> Any:
+        entry = getattr(owner, _OWNER_STORAGE_ATTR, _EMPTY_STORAGE).get(self)
+        if entry is None or entry[0] is not owner:
+            return default
+        if self.tracks_access:
+            self.touch(owner)
+        return entry[1]
+
+    def set(self, owner: type, value: Any) -> None:
+        storage = owner.__dict__.get(_OWNER_STORAGE_ATTR)
+        if storage is None:
+            storage = {}
+            type.__setattr__(owner, _OWNER_STORAGE_ATTR, storage)
+        storage[self] = owner, value
+        self._owner_refs[weakref.ref(owner, self._forget_ref)] = None
+        if self.max_size is not None:
+            while len(self._owner_refs) > self.max_size:
+                owner_ref, _ = self._owner_refs.popitem(last=False)
+                evicted_owner = owner_ref()
+                if evicted_owner is not None:
+                    evicted_owner.__dict__[_OWNER_STORAGE_ATTR].pop(self, None)
+
+    def pop(self, owner: type) -> None:
+        storage = owner.__dict__.get(_OWNER_STORAGE_ATTR)
+        if storage is not None:
+            storage.pop(self, None)
+        self._owner_refs.pop(weakref.ref(owner), None)
+
+    def clear(self) -> None:
+        for owner_ref in list(self._owner_refs):
+            owner = owner_ref()
+            if owner is not None:
+                owner.__dict__[_OWNER_STORAGE_ATTR].pop(self, None)
+        self._owner_refs.clear()
+
+
 class FactoryProperty:
     """
     A descriptor that returns an object related to the owner class
@@ -32,10 +130,17 @@ class FactoryProperty:
         self.factory = factory
         self.args = args
         self.kwargs = kwargs
-        self._cls_map = {}
+        self._cls_map = _OwnerMap()
         self._name = None  # type: str
         self._owner = None  # type: type
         self._is_terminal = False
+        self._init_locks()
+
+    def _init_locks(self) -> None:
+        # guards name resolution, ``_cls_map`` modification and ``_owner_locks``
+        self._lock = threading.RLock()
+        # locks for owners whose objects are being created
+        self._owner_locks = {}  # type: Dict[type, threading.RLock]
 
     def __set_name__(self, owner: type, name: str):
         self._name = name
@@ -60,6 +165,35 @@ class FactoryProperty:
 
     def __get__(self, instance, owner):
         if self._name is None:  # has not been set yet
+            self._resolve_name(owner)
+
+        if self._is_terminal:
+            # always return subclass of the original owner
+            owner = self._owner
+
+        # lock-free fast path for owners that already have their object,
+        # same as ``self._cls_map.get(owner)`` without the call overhead
+        cls_map = self._cls_map
+        try:
+            stored_owner, result = owner.__classical_factory_cache__[cls_map]
+        except (AttributeError, KeyError):
+            stored_owner = result = None
+        if stored_owner is owner:
+            if cls_map.tracks_access:
+                cls_map.touch(owner)
+            if metrics.ENABLED:
+                metrics.record('descriptors.cache.hit')
+            return result
+
+        if metrics.ENABLED:
+            metrics.record('descriptors.cache.miss')
+        return self._create(owner)
+
+    def _resolve_name(self, owner: type) -> None:
+        with self._lock:
+            if self._name is not None:  # resolved by another thread
+                return
+
             # get the name of the attribute - it will serve as the name
             # of the new partial class
             original_owner, own_name = self._get_owner_and_name(owner)
@@ -68,14 +202,90 @@ class FactoryProperty:
 
             self.__set_name__(owner=original_owner, name=own_name)
 
-        if self._is_terminal:
-            # always return subclass of the original owner
-            owner = self._owner
+    def _create(self, owner: type) -> Any:
+        """
+        Create the object for ``owner``, making sure that the factory
+        is called only once even if several threads get here at the same time
+        """
+        with self._lock:
+            owner_lock = self._owner_locks.get(owner)
+            if owner_lock is None:
+                owner_lock = self._owner_locks[owner] = threading.RLock()
 
-        if owner not in self._cls_map:
-            self._cls_map[owner] = self.factory(owner, self._name, *self.args, **self.kwargs)
+        try:
+            with owner_lock:
+                result = self._cls_map.get(owner, _MISSING)
+                if result is _MISSING:  # not created by another thread
+                    if metrics.ENABLED:
+                        start = time.perf_counter()
+                        result = self._make(owner)
+                        metrics.record('descriptors.factory', duration=time.perf_counter() - start)
+                    else:
+                        result = self._make(owner)
+                    with self._lock:
+                        self._cls_map.set(owner, result)
+        finally:
+            with self._lock:
+                self._owner_locks.pop(owner, None)
+
+        return result
+
+    def _make(self, owner: type) -> Any:
+        return self.factory(owner, self._name, *self.args, **self.kwargs)
+
+    def _copy(self) -> 'FactoryProperty':
+        self_copy = copy.copy(self)
+        self_copy._cls_map = _OwnerMap(max_size=self._cls_map.max_size, eviction=self._cls_map.eviction)
+        self_copy._init_locks()
+        return self_copy
+
+    @property
+    def cache_size(self) -> int:
+        """
+        Number of owner classes that currently have an object created for them
+        """
+        return len(self._cls_map)
+
+    def invalidate(self, owner: type) -> None:
+        """
+        Forget the object created for ``owner``,
+        it will be re-created on the next access.
+
+        The descriptor object itself can be accessed
+        via the owner's ``__dict__``:
+        ::
+
+            Thing.__dict__['Red'].invalidate(Thing)
+
+        """
+        with self._lock:
+            self._cls_map.pop(owner)
+
+    def clear(self) -> None:
+        """
+        Forget the objects created for all owners
+        """
+        with self._lock:
+            self._cls_map.clear()
+
+    def limited(self, max_size: int, eviction: str = EVICTION_LRU) -> 'FactoryProperty':
+        """
+        Return a version of the property that keeps objects
+        for at most ``max_size`` owner classes.
+
+        :param max_size: maximum number of owner classes
+        :param eviction: which object to discard when the limit is reached:
+            ``'lru'`` (default) for the least recently used one,
+            ``'fifo'`` for the oldest one
+        ::
+
+            class Tenant:
+                Current = ArgumentedSubclass(active=True).limited(1000)
 
-        return self._cls_map[owner]
+        """
+        self_copy = self._copy()
+        self_copy._cls_map = _OwnerMap(max_size=max_size, eviction=eviction)
+        return self_copy
 
     @property
     def terminal(self) -> 'FactoryProperty':
@@ -101,12 +311,29 @@ class FactoryProperty:
             ClassyThing.terminal_thing.__class__  # Thing
 
         """
-        self_copy = copy.copy(self)
+        self_copy = self._copy()
         self_copy._is_terminal = True
         return self_copy
 
 
-class DummySubclass(FactoryProperty):
+class _SubclassProperty(FactoryProperty):
+    """
+    Base class for descriptors that create subclasses of their owners.
+
+    The subclasses get a qualified name that resolves
+    to the descriptor itself (e.g. ``Polygon.Pentagon.Blue``),
+    so ``pickle`` can find them by reference
+    and gets the same subclass on the receiving side.
+    """
+
+    def _make(self, owner: type) -> Any:
+        subclass = super()._make(owner)
+        subclass.__module__ = owner.__module__
+        subclass.__qualname__ = '{}.{}'.format(owner.__qualname__, self._name)
+        return subclass
+
+
+class DummySubclass(_SubclassProperty):
     """
     A descriptor that returns a copy of the owner class when accessed
     (but with a new name equal to the attribute's name).
@@ -116,7 +343,7 @@ class DummySubclass(FactoryProperty):
         super().__init__(argumented_subclass)
 
 
-class ArgumentedSubclass(FactoryProperty):
+class ArgumentedSubclass(_SubclassProperty):
     """
     A descriptor that returns an :func:`~classical.subclass.argumented_subclass`
     of the owner class when accessed.
@@ -156,7 +383,7 @@ class ArgumentedSubclass(FactoryProperty):
         super().__init__(argumented_subclass, *args, **kwargs)
 
 
-class AttributedSubclass(FactoryProperty):
+class AttributedSubclass(_SubclassProperty):
     """
     A descriptor that returns an :func:`~classical.subclass.attributed_subclass`
     of the owner class when accessed.
@@ -228,6 +455,17 @@ class AutoProperty(FactoryProperty):
 
         isinstance(ClassyThing.terminal_thing, ClassyThing)  # False
         ClassyThing.terminal_thing.__class__  # Thing
+
+    Unlike subclasses created by the other descriptors, the instances
+    are pickled by value, like any other instance of the owner class:
+    the unpickled object is a copy, not the instance returned by the property
+    (``pickle`` looks up reduction methods on the class,
+    so the property's instance can't be reduced differently from the others).
+    Pickle the owner class and the property name instead if identity matters:
+    ::
+
+        owner, name = pickle.loads(pickle.dumps((Thing, 'book')))
+        getattr(owner, name) is Thing.book  # True
     """
 
     def __init__(self, *args, **kwargs):
@@ -0,0 +1,104 @@
+"""
+Bulk conversion of fielded objects from asynchronous iterables.
+
+Requires Python 3.6+ (asynchronous generators),
+so the module is not imported by the rest of the package.
+"""
+
+import asyncio
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional, Type
+
+from classical.fields.bulk import ON_MISMATCH_ERROR, _PlanSelector
+from classical.fields.functions import StrCollection
+
+
+# Number of objects converted between yields to the event loop
+DEFAULT_YIELD_EVERY = 256
+
+
+async def acopy_many(
+        srcs: AsyncIterable[Any], dst_cls: Type,
+        exclude_names: StrCollection = (),
+        ignore_extra: bool = False,
+        ignore_missing: bool = False,
+        defaults: Optional[Dict[str, Any]] = None,
+        on_mismatch: str = ON_MISMATCH_ERROR,
+        yield_every: int = DEFAULT_YIELD_EVERY,
+) -> AsyncIterator[Any]:
+    """
+    Asynchronous version of :func:`~classical.fields.bulk.copy_many`:
+    convert fielded objects from ``srcs`` to instances of ``dst_cls``.
+
+    Objects are pulled from ``srcs`` only when the consumer asks for the next one.
+    Control is returned to the event loop after every ``yield_every`` objects,
+    so converting a large batch of already fetched objects doesn't block the loop.
+
+    :param srcs: asynchronous iterable of source objects
+    :param dst_cls: destination class
+    :param yield_every: number of objects converted between yields to the event loop
+    :return: asynchronous iterator of ``dst_cls`` instances
+
+    All other arguments have the same meaning as for :func:`~classical.fields.bulk.copy_many`
+    ::
+
+        async for dto in acopy_many(await conn.stream(query), UserDTO):
+            await send(dto)
+
+    """
+    if yield_every < 1:
+        raise ValueError('yield_every must be positive')
+    selector = _PlanSelector(
+        dst_cls, exclude_names=exclude_names,
+        ignore_extra=ignore_extra, ignore_missing=ignore_missing,
+        defaults=defaults, on_mismatch=on_mismatch,
+    )
+
+    converter = None
+    fast_cls = None  # type: Optional[type]
+    countdown = yield_every
+    async for src in srcs:
+        if type(src) is not fast_cls:
+            src_converter = selector.get_converter(src)
+            if src_converter is None:
+                continue
+            converter, fast_cls = src_converter, selector.fast_cls
+        yield converter._convert(src, defaults)  # noqa
+
+        countdown -= 1
+        if not countdown:
+            countdown = yield_every
+            await asyncio.sleep(0)
+
+
+async def acopy_many_chunked(
+        srcs: AsyncIterable[Any], dst_cls: Type,
+        chunk_size: int,
+        exclude_names: StrCollection = (),
+        ignore_extra: bool = False,
+        ignore_missing: bool = False,
+        defaults: Optional[Dict[str, Any]] = None,
+        on_mismatch: str = ON_MISMATCH_ERROR,
+) -> AsyncIterator[List[Any]]:
+    """
+    Same as :func:`~classical.fields.aio.acopy_many`,
+    but yields lists of up to ``chunk_size`` converted objects.
+    Control is returned to the event loop after every chunk.
+
+    :param chunk_size: maximum number of objects in a chunk
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be positive')
+
+    converted = acopy_many(
+        srcs, dst_cls, exclude_names=exclude_names,
+        ignore_extra=ignore_extra, ignore_missing=ignore_missing,
+        defaults=defaults, on_mismatch=on_mismatch, yield_every=chunk_size,
+    )
+    chunk = []  # type: List[Any]
+    async for obj in converted:
+        chunk.append(obj)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -1,18 +1,20 @@
+from typing import List
+
 from classical.fields.base import ClassField, FieldInspector, FieldSchema
 
 
 class AttrsFieldInspector(FieldInspector[ClassField]):
+    priority = 40
+
     @classmethod
-    def _validate_cls(cls, insp_cls: type) -> None:
-        attrs = getattr(insp_cls, "__attrs_attrs__", None)
-        if attrs is None:
-            cls._raise_unsupported_field_class(insp_cls=insp_cls)
+    def _matches(cls, insp_cls: type) -> bool:
+        return getattr(insp_cls, "__attrs_attrs__", None) is not None
 
     @classmethod
     def _get_class_fields(cls, insp_cls: type) -> FieldSchema[ClassField]:
         cls._validate_cls(insp_cls)
-        result = FieldSchema()
+        result = []  # type: List[ClassField]
         for field in insp_cls.__attrs_attrs__:  # noqa
             init_name = field.name.lstrip("_")  # same logic as attrs uses internally
             result.append(ClassField(init_name=init_name, attr_name=field.name))
-        return result
+        return FieldSchema(result)
@@ -1,5 +1,12 @@
 import abc
-from typing import Any, Dict, Generic, List, NoReturn, TypeVar
+import functools
+import operator
+import threading
+import weakref
+from typing import (
+    AbstractSet, Any, Callable, Dict, FrozenSet, Generic, Iterable, List, NoReturn, Optional, Tuple, TypeVar,
+    Union,
+)
 
 
 class ClassField:
@@ -7,21 +14,61 @@ class ClassField:
     Representation of a data field.
     """
 
-    __slots__ = ('init_name', 'attr_name')
+    __slots__ = ('init_name', 'attr_name', 'index', '_hash', '__weakref__')
+
+    # Identical fields are interned, so that schemas of different classes share them
+    _interned = weakref.WeakValueDictionary()  # type: weakref.WeakValueDictionary
+    _interned_lock = threading.Lock()
+
+    def __new__(cls, *args: Any, **kwargs: Any):
+        if cls is not ClassField:
+            # subclasses can take other arguments, so they are not interned
+            return super().__new__(cls)
+        key = _get_intern_key(*args, **kwargs)
+        field = cls._interned.get(key)
+        if field is None:
+            with cls._interned_lock:
+                field = cls._interned.get(key)
+                if field is None:
+                    field = super().__new__(cls)
+                    # initialize before the field is shared with other threads
+                    field._set_names(*key)
+                    cls._interned[key] = field
+        return field
+
+    def __init__(self, init_name: str, attr_name: str, index: Optional[int] = None):
+        """
+        :param init_name: name of the field's argument of ``__init__``
+        :param attr_name: name of the field's attribute
+        :param index: position of the field's value for positional classes
+            (e.g. namedtuples), used by their schemas for faster access;
+            not taken into account when fields are compared
+        """
+        if type(self) is not ClassField:
+            # interned fields are initialized once, by ``__new__``
+            self._set_names(init_name, attr_name, index)
 
-    def __init__(self, init_name: str, attr_name: str):
+    def _set_names(self, init_name: str, attr_name: str, index: Optional[int]) -> None:
         # self.init_name = init_name
         super().__setattr__('init_name', init_name)
         # self.attr_name = attr_name
         super().__setattr__('attr_name', attr_name)
+        # self.index = index
+        super().__setattr__('index', index)
+        super().__setattr__('_hash', hash((init_name, attr_name)))
 
     def __hash__(self) -> int:
-        return hash((self.init_name, self.attr_name))
+        return self._hash
+
+    def __reduce__(self):
+        return type(self), (self.init_name, self.attr_name, self.index)
 
     def __setattr__(self, key, value) -> None:
         raise AttributeError
 
     def __eq__(self, other) -> bool:
+        if self is other:
+            return True
         if isinstance(other, ClassField):
             return self.init_name == other.init_name and self.attr_name == other.attr_name
         return False
@@ -63,12 +110,9 @@ class ClassField:
             field_size[attrs_obj]  # == 34
 
         """
-        try:
-            return getattr(obj, self.attr_name)
-        except AttributeError:
-            if isinstance(obj, dict):
-                return obj[self.attr_name]
-            raise
+        if isinstance(obj, dict):
+            return obj[self.attr_name]
+        return getattr(obj, self.attr_name)
 
     def set_value(self, obj: Any, value: Any) -> None:
         """
@@ -97,12 +141,10 @@ class ClassField:
             field_color[attrs_obj] = 'blue'  # attrs_obj.color == 'blue'
 
         """
-        try:
+        if isinstance(obj, dict):
+            obj[self.attr_name] = value
+        else:
             setattr(obj, self.attr_name, value)
-        except AttributeError:
-            if isinstance(obj, dict):
-                obj[self.attr_name] = value
-            raise
 
     def __getitem__(self, obj: Any) -> Any:
         """
@@ -117,20 +159,185 @@ class ClassField:
         self.set_value(obj=obj, value=value)
 
 
+def _get_intern_key(init_name: str, attr_name: str, index: Optional[int] = None) -> Tuple[str, str, Optional[int]]:
+    """
+    Return the key of an interned :class:`ClassField` with the given constructor arguments
+    """
+    return init_name, attr_name, index
+
+
 _ClassFieldType = TypeVar('_ClassFieldType', bound='ClassField')
 
 
+def _mutator(method: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap an in-place ``list`` method of :class:`FieldSchema`
+    to refuse changes of frozen schemas and to keep indexes of the others up to date
+    """
+    @functools.wraps(method)
+    def wrapper(self: 'FieldSchema', *args: Any, **kwargs: Any) -> Any:
+        if self.frozen:
+            raise TypeError('{} is frozen'.format(type(self).__name__))
+        result = method(self, *args, **kwargs)
+        self._reindex()
+        return result
+    return wrapper
+
+
 class FieldSchema(List[_ClassFieldType]):
+    """
+    List of class fields.
+
+    Schemas cached by inspectors are shared between callers, so they are frozen
+    (see :meth:`freeze`) and all in-place modifications of them raise ``TypeError``.
+    Schemas created by the caller can be modified like lists.
+    """
+
+    append = _mutator(list.append)
+    extend = _mutator(list.extend)
+    insert = _mutator(list.insert)
+    remove = _mutator(list.remove)
+    pop = _mutator(list.pop)
+    clear = _mutator(list.clear)
+    sort = _mutator(list.sort)
+    reverse = _mutator(list.reverse)
+    __delitem__ = _mutator(list.__delitem__)
+    __iadd__ = _mutator(list.__iadd__)
+    __imul__ = _mutator(list.__imul__)
+
+    # Used to assign values in ``set_field_dict``: ``set_value(obj, attr_name, value)``
+    _set_value = staticmethod(setattr)
+
+    # Attribute names of fields that instances are not required to have (e.g. keys of a non-total TypedDict)
+    optional_names = frozenset()  # type: FrozenSet[str]
+
+    def __init__(self, fields: Iterable[_ClassFieldType] = ()):
+        super().__init__(fields)
+        self.frozen = False
+        self._reindex()
+
+    def _reindex(self) -> None:
+        """
+        (Re)build indexes of the fields and reset caches that depend on them
+        """
+        self.attr_names = tuple(field.attr_name for field in self)  # type: Tuple[str, ...]
+        self.init_names = tuple(field.init_name for field in self)  # type: Tuple[str, ...]
+        self.fields_by_attr_name = dict(zip(self.attr_names, self))  # type: Dict[str, _ClassFieldType]
+        self.fields_by_init_name = dict(zip(self.init_names, self))  # type: Dict[str, _ClassFieldType]
+        # Order-independent identity of the field set, equal for analogous schemas
+        self.fingerprint = frozenset(self)  # type: FrozenSet[_ClassFieldType]
+        self._value_getter = None  # type: Optional[Callable[[Any], Tuple[Any, ...]]]
+        # cached results of ``project`` and ``exclude``
+        self._projections = {}  # type: Dict[Tuple[str, ...], FieldSchema[_ClassFieldType]]
+        self._exclusions = {}  # type: Dict[AbstractSet[str], FieldSchema[_ClassFieldType]]
+
+    def freeze(self) -> 'FieldSchema[_ClassFieldType]':
+        """
+        Forbid further in-place modifications of the schema.
+
+        :return: the schema itself
+        """
+        self.frozen = True
+        return self
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+    def _derive(self, fields: Iterable[_ClassFieldType]) -> 'FieldSchema[_ClassFieldType]':
+        """
+        Create a schema of the same type with a subset of the fields
+        (used by ``project`` and ``exclude``, which cache and share the result)
+        """
+        return type(self)(fields).freeze()
+
+    def project(self, names: Iterable[str]) -> 'FieldSchema[_ClassFieldType]':
+        """
+        Return a schema of the fields with the given names (in the given order).
+        The result is cached.
+
+        :param names: attribute names of fields
+        :return: schema of the same type
+        """
+        names = tuple(names)
+        projection = self._projections.get(names)
+        if projection is None:
+            unknown_names = [name for name in names if name not in self.fields_by_attr_name]
+            if unknown_names:
+                raise ValueError('Unknown fields: {}'.format(unknown_names))
+            projection = self._derive(self.fields_by_attr_name[name] for name in names)
+            self._projections[names] = projection
+        return projection
+
+    def exclude(self, names: Union[AbstractSet[str], Iterable[str]]) -> 'FieldSchema[_ClassFieldType]':
+        """
+        Return a schema without the fields with the given names.
+        The result is cached.
+
+        :param names: attribute names of fields to exclude
+        :return: schema of the same type
+        """
+        if not names:
+            return self
+        names = frozenset(names)
+        exclusion = self._exclusions.get(names)
+        if exclusion is None:
+            exclusion = self._derive(field for field in self if field.attr_name not in names)
+            self._exclusions[names] = exclusion
+        return exclusion
+
+    def get_fingerprint(
+            self, exclude_names: Union[AbstractSet[str], Iterable[str]] = (),
+    ) -> FrozenSet[_ClassFieldType]:
+        """
+        Return the fingerprint of the schema without the fields with the given names.
+        Schemas with equal fingerprints have the same fields.
+
+        :param exclude_names: attribute names of fields to omit
+        :return: hashable fingerprint
+        """
+        return self.exclude(exclude_names).fingerprint
+
+    def _make_value_getter(self) -> Callable[[Any], Tuple[Any, ...]]:
+        """
+        Compile a function that returns a tuple of the object's field values
+        (in the order of the schema's fields).
+        """
+        return _make_tuple_getter(operator.attrgetter, self.attr_names)
+
+    def get_values(self, obj: Any) -> Tuple[Any, ...]:
+        """
+        Return tuple of ``obj``'s field values in the order of the schema's fields.
+
+        :param obj: fielded instance
+        :return: tuple of values
+        """
+        value_getter = self._value_getter
+        if value_getter is None:
+            value_getter = self._value_getter = self._make_value_getter()
+        try:
+            return value_getter(obj)
+        except AttributeError:
+            # the object does not match the compiled getter (e.g. a dict)
+            return tuple(field.get_value(obj) for field in self)
+
     def get_field_dict(self, obj: Any) -> Dict[_ClassFieldType, Any]:
-        result = {}  # type: Dict[_ClassFieldType, Any]
-        for field in self:
-            result[field] = field[obj]
-        return result
+        return dict(zip(self, self.get_values(obj)))
+
+    def get_name_dict(self, obj: Any, init_mode: bool = False) -> Dict[str, Any]:
+        """
+        Return dict of ``obj``'s field names and their values.
+
+        :param obj: fielded instance
+        :param init_mode: use fields' ``init_name`` instead of ``attr_name`` as the dict's keys
+        :return: dict with field names as keys
+        """
+        return dict(zip(self.init_names if init_mode else self.attr_names, self.get_values(obj)))
 
     def set_field_dict(self, obj: Any, values: Dict[_ClassFieldType, Any]) -> None:
-        for field in self:
+        set_value = self._set_value
+        for field, attr_name in zip(self, self.attr_names):
             if field in values:
-                field[obj] = values[field]
+                set_value(obj, attr_name, values[field])
 
     def __getitem__(self, obj: Any) -> Dict[_ClassFieldType, Any]:
         return self.get_field_dict(obj=obj)
@@ -139,7 +346,51 @@ class FieldSchema(List[_ClassFieldType]):
         self.set_field_dict(obj=obj, values=values)
 
 
+def _make_tuple_getter(
+        getter_factory: Callable[..., Callable[[Any], Any]],
+        keys: Tuple[Any, ...],
+) -> Callable[[Any], Tuple[Any, ...]]:
+    """
+    Wrap ``operator.attrgetter``/``operator.itemgetter`` so that
+    a tuple is returned for any number of keys.
+    """
+    if not keys:
+        return lambda obj: ()
+    getter = getter_factory(*keys)
+    if len(keys) == 1:
+        return lambda obj: (getter(obj),)
+    return getter
+
+
 class FieldInspector(abc.ABC, Generic[_ClassFieldType]):
+    # Set to ``True`` if instances of the same class can have different fields
+    _fields_vary_by_instance = False
+
+    # Inspectors with higher priority are preferred
+    # when a class is supported by several of them
+    priority = 0
+
+    @classmethod
+    def _matches(cls, insp_cls: type) -> bool:
+        """
+        Check whether ``insp_cls`` is supported by the inspector.
+
+        Should be overridden with a cheap check that doesn't raise exceptions;
+        the default implementation calls ``_validate_cls``.
+        """
+        if cls._validate_cls.__func__ is FieldInspector._validate_cls.__func__:  # noqa
+            raise NotImplementedError('Either _matches or _validate_cls must be implemented')
+        try:
+            cls._validate_cls(insp_cls)
+        except TypeError:
+            return False
+        return True
+
+    @classmethod
+    def _validate_cls(cls, insp_cls: type) -> None:
+        if not cls._matches(insp_cls):
+            cls._raise_unsupported_field_class(insp_cls=insp_cls)
+
     @classmethod
     def _raise_unsupported_field_class(cls, insp_cls: type) -> NoReturn:
         raise TypeError(
@@ -169,6 +420,20 @@ class FieldInspector(abc.ABC, Generic[_ClassFieldType]):
     def _get_instance_fields(cls, obj: Any) -> FieldSchema[_ClassFieldType]:
         return cls._get_class_fields(type(obj))
 
+    @classmethod
+    def get_constructor(
+            cls, insp_cls: type, init_names: Tuple[str, ...],
+    ) -> Callable[[Tuple[Any, ...]], Any]:
+        """
+        Return a function that creates an instance of ``insp_cls``
+        from a tuple of values of the fields listed in ``init_names``.
+
+        :param insp_cls: fielded class
+        :param init_names: ``init_name`` of fields in the order of values
+        :return: callable that takes a tuple of values
+        """
+        return lambda values: insp_cls(**dict(zip(init_names, values)))
+
     @classmethod
     def get_field_dict(cls, obj: Any) -> Dict[_ClassFieldType, Any]:
         """
@@ -203,11 +468,8 @@ class FieldInspector(abc.ABC, Generic[_ClassFieldType]):
         if attr_mode is True and init_mode is True:
             raise ValueError('attr_mode and init_mode cannot both be True')
 
-        result = {}  # type: Dict[str, Any]
-        for field in cls._get_instance_fields(obj):
-            key = field.attr_name if attr_mode else field.init_name
-            result[key] = field[obj]
-        return result
+        field_schema = cls._get_instance_fields(obj)
+        return field_schema.get_name_dict(obj, init_mode=init_mode)
 
     @classmethod
     def get_name_list(
@@ -231,8 +493,5 @@ class FieldInspector(abc.ABC, Generic[_ClassFieldType]):
         if attr_mode is True and init_mode is True:
             raise ValueError('attr_mode and init_mode cannot both be True')
 
-        result = []  # type: List[str]
-        for field in cls._get_instance_fields(obj):
-            key = field.attr_name if attr_mode else field.init_name
-            result.append(key)
-        return result
+        field_schema = cls._get_instance_fields(obj)
+        return list(field_schema.attr_names if attr_mode else field_schema.init_names)
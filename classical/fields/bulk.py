@@ -0,0 +1,369 @@
+"""
+Bulk operations over collections of fielded objects
+"""
+
+import array
+import itertools
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Type, Union
+
+from classical.fields.functions import (
+    Converter, FieldComparison, StrCollection, _get_comparison_for, _get_converter_for, _get_schema_key, get_fields,
+)
+from classical.fields.generic import GenericFieldInspector
+
+
+COLUMNS_LIST = 'list'
+COLUMNS_ARRAY = 'array'
+COLUMNS_NUMPY = 'numpy'
+
+_COLUMNS_OPTIONS = (COLUMNS_LIST, COLUMNS_ARRAY, COLUMNS_NUMPY)
+
+ON_MISMATCH_ERROR = 'error'
+ON_MISMATCH_REPLAN = 'replan'
+ON_MISMATCH_SKIP = 'skip'
+
+_ON_MISMATCH_OPTIONS = (ON_MISMATCH_ERROR, ON_MISMATCH_REPLAN, ON_MISMATCH_SKIP)
+
+
+class _PlanSelector:
+    """
+    Resolve conversion plans for a stream of source objects,
+    handling objects that don't match the current plan according to ``on_mismatch``.
+    """
+
+    def __init__(
+            self, dst_cls: Type,
+            exclude_names: StrCollection,
+            ignore_extra: bool,
+            ignore_missing: bool,
+            defaults: Optional[Dict[str, Any]],
+            on_mismatch: str,
+    ):
+        if on_mismatch not in _ON_MISMATCH_OPTIONS:
+            raise ValueError('Invalid on_mismatch value: {!r}, must be one of {}'.format(
+                on_mismatch, _ON_MISMATCH_OPTIONS))
+        self.dst_cls = dst_cls
+        self.exclude_names = exclude_names
+        self.ignore_extra = ignore_extra
+        self.ignore_missing = ignore_missing
+        self.defaults = defaults
+        self.on_mismatch = on_mismatch
+        self.converter = None  # type: Optional[Converter]
+        # Class whose instances are converted with ``converter`` without checks,
+        # ``None`` if fields vary by instance
+        self.fast_cls = None  # type: Optional[type]
+        self._plan_key = None  # type: Optional[Tuple[type, Optional[Tuple[str, ...]]]]
+
+    def get_converter(self, src: Any) -> Optional[Converter]:
+        """
+        Return converter for ``src`` or ``None`` if it should be skipped
+        """
+        key = _get_schema_key(src)
+        if self.converter is not None:
+            if self._matches_plan(key):
+                return self.converter
+            if self.on_mismatch == ON_MISMATCH_SKIP:
+                return None
+            if self.on_mismatch == ON_MISMATCH_ERROR:
+                raise ValueError('Heterogeneous source objects: {} and {}'.format(
+                    _describe_schema_key(self._plan_key), _describe_schema_key(key)))
+
+        self.converter = _get_converter_for(
+            src, self.dst_cls, exclude_names=self.exclude_names,
+            ignore_extra=self.ignore_extra, ignore_missing=self.ignore_missing,
+            defaults=self.defaults,
+        )
+        self._plan_key = key
+        self.fast_cls = key[0] if key[1] is None else None
+        return self.converter
+
+    def _matches_plan(self, key: Tuple[type, Optional[Tuple[str, ...]]]) -> bool:
+        plan_key = self._plan_key
+        if key == plan_key:
+            return True
+        # values are accessed by name, so the plan works for any order of the fields (e.g. dict keys)
+        return (
+            key[0] is plan_key[0] and key[1] is not None and plan_key[1] is not None
+            and len(key[1]) == len(plan_key[1]) and set(key[1]) == set(plan_key[1])
+        )
+
+
+def _describe_schema_key(key: Tuple[type, Optional[Tuple[str, ...]]]) -> str:
+    if key[1] is None:
+        return key[0].__name__
+    return '{} with fields {}'.format(key[0].__name__, list(key[1]))
+
+
+def copy_many(
+        srcs: Iterable[Any], dst_cls: Type,
+        exclude_names: StrCollection = (),
+        ignore_extra: bool = False,
+        ignore_missing: bool = False,
+        defaults: Optional[Dict[str, Any]] = None,
+        on_mismatch: str = ON_MISMATCH_ERROR,
+) -> Iterator[Any]:
+    """
+    Lazily convert fielded objects from ``srcs`` to instances of ``dst_cls``.
+
+    The conversion plan is resolved once from the first element
+    and reused for the following ones.
+    All other arguments have the same meaning as for
+    :func:`~classical.fields.functions.copy_to_class`
+
+    :param srcs: iterable of source objects
+    :param dst_cls: destination class
+    :param exclude_names: field names to omit from the copy procedure
+    :param ignore_extra: ignore extra fields in source; default is ``False``
+    :param ignore_missing: ignore fields missing in source; default is ``False``
+    :param defaults: default values for missing fields
+    :param on_mismatch: what to do with an element whose class (or field set)
+        differs from the first element's:
+        ``'error'`` (default) raises ``ValueError``,
+        ``'replan'`` resolves a new plan for it,
+        ``'skip'`` silently drops it
+    :return: iterator of ``dst_cls`` instances
+
+    ::
+
+        for dto in copy_many(session.query(UserModel), UserDTO):
+            send(dto)
+
+    """
+    selector = _PlanSelector(
+        dst_cls, exclude_names=exclude_names,
+        ignore_extra=ignore_extra, ignore_missing=ignore_missing,
+        defaults=defaults, on_mismatch=on_mismatch,
+    )
+    return _copy_many(srcs, selector)
+
+
+def _copy_many(srcs: Iterable[Any], selector: _PlanSelector) -> Iterator[Any]:
+    defaults = selector.defaults
+    converter = None  # type: Optional[Converter]
+    fast_cls = None  # type: Optional[type]
+    for src in srcs:
+        if type(src) is not fast_cls:
+            src_converter = selector.get_converter(src)
+            if src_converter is None:
+                continue
+            converter, fast_cls = src_converter, selector.fast_cls
+        # fast path for homogeneous collections
+        yield converter._convert(src, defaults)  # noqa
+
+
+def copy_many_chunked(
+        srcs: Iterable[Any], dst_cls: Type,
+        chunk_size: int,
+        exclude_names: StrCollection = (),
+        ignore_extra: bool = False,
+        ignore_missing: bool = False,
+        defaults: Optional[Dict[str, Any]] = None,
+        on_mismatch: str = ON_MISMATCH_ERROR,
+) -> Iterator[List[Any]]:
+    """
+    Same as :func:`~classical.fields.bulk.copy_many`,
+    but yields lists of up to ``chunk_size`` converted objects
+
+    :param chunk_size: maximum number of objects in a chunk
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be positive')
+
+    converted = copy_many(
+        srcs, dst_cls, exclude_names=exclude_names,
+        ignore_extra=ignore_extra, ignore_missing=ignore_missing,
+        defaults=defaults, on_mismatch=on_mismatch,
+    )
+    yield from _iter_chunks(converted, chunk_size)
+
+
+def _iter_chunks(items: Iterable[Any], chunk_size: int) -> Iterator[List[Any]]:
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _to_array(values: List[Any]) -> Union[List[Any], array.array]:
+    """
+    Pack values into an ``array.array`` if they are all ints or floats,
+    otherwise return the list as is.
+    """
+    value_types = set(map(type, values))
+    if value_types == {int}:
+        typecode = 'q'
+    elif value_types and value_types <= {int, float}:
+        typecode = 'd'
+    else:
+        return values
+    try:
+        return array.array(typecode, values)
+    except OverflowError:
+        return values
+
+
+def to_columns(
+        objs: Iterable[Any],
+        fields: Optional[Sequence[str]] = None,
+        kind: str = COLUMNS_LIST,
+        batch_size: int = 1024,
+) -> Dict[str, Any]:
+    """
+    Extract values of fielded objects into per-field columns.
+
+    The field schema is resolved from the first object,
+    the rest of the objects are expected to have the same fields.
+
+    :param objs: iterable of fielded objects
+    :param fields: attribute names of fields to extract; all fields by default
+    :param kind: type of columns:
+        ``'list'`` (default) for lists,
+        ``'array'`` for ``array.array`` (columns with values
+        other than ints or floats are left as lists),
+        ``'numpy'`` for NumPy arrays with inferred dtype (requires ``numpy``)
+    :param batch_size: number of objects processed at once
+    :return: dict of field name -> column of values
+
+    ::
+
+        to_columns([Point(x=1, y=2), Point(x=3, y=4)])
+        # {'x': [1, 3], 'y': [2, 4]}
+
+    """
+    if kind not in _COLUMNS_OPTIONS:
+        raise ValueError('Invalid kind value: {!r}, must be one of {}'.format(kind, _COLUMNS_OPTIONS))
+    if kind == COLUMNS_NUMPY:
+        import numpy  # noqa, optional dependency
+
+    columns = None  # type: Optional[Dict[str, List[Any]]]
+    # columns in the order of the schema's fields
+    column_lists = []  # type: List[List[Any]]
+    schema = None
+    for batch in _iter_chunks(objs, batch_size):
+        if schema is None:
+            schema = get_fields(batch[0])
+            if fields is not None:
+                schema = schema.project(fields)
+            columns = {name: [] for name in schema.attr_names}
+            column_lists = [columns[name] for name in schema.attr_names]
+
+        rows = list(map(schema.get_values, batch))
+        for column, values in zip(column_lists, zip(*rows)):
+            column.extend(values)
+
+    if columns is None:
+        columns = {name: [] for name in fields or ()}
+
+    if kind == COLUMNS_ARRAY:
+        return {name: _to_array(values) for name, values in columns.items()}
+    if kind == COLUMNS_NUMPY:
+        return {name: numpy.asarray(values) for name, values in columns.items()}
+    return columns
+
+
+def from_columns(dst_cls: Type, columns: Mapping[str, Sequence[Any]]) -> Iterator[Any]:
+    """
+    Lazily create instances of fielded class ``dst_cls`` from columnar data.
+    This is the inverse of :func:`~classical.fields.bulk.to_columns`.
+
+    :param dst_cls: destination class
+    :param columns: dict of field name (``attr_name`` or ``init_name``) -> sequence of values;
+        sequences may be lists, tuples, ``array.array`` or NumPy arrays.
+        Fields without a column are left to ``dst_cls``'s defaults
+    :return: iterator of ``dst_cls`` instances
+
+    ::
+
+        list(from_columns(Point, {'x': [1, 3], 'y': [2, 4]}))
+        # [Point(x=1, y=2), Point(x=3, y=4)]
+
+    """
+    column_names = set(columns)
+    init_names = []  # type: List[str]
+    value_columns = []  # type: List[Sequence[Any]]
+    if GenericFieldInspector.fields_vary_by_instance(dst_cls):
+        # e.g. dict, instances are not limited to the fields of the class
+        init_names = list(columns)
+        value_columns = list(columns.values())
+        column_names.clear()
+    else:
+        for field in get_fields(dst_cls):
+            for name in (field.attr_name, field.init_name):
+                if name in column_names:
+                    init_names.append(field.init_name)
+                    value_columns.append(columns[name])
+                    column_names.discard(field.attr_name)
+                    column_names.discard(field.init_name)
+                    break
+
+    if column_names:
+        raise ValueError('Unknown fields: {}'.format(sorted(column_names)))
+
+    lengths = {len(column) for column in value_columns}
+    if len(lengths) > 1:
+        raise ValueError('Columns have different lengths: {}'.format(sorted(lengths)))
+
+    # NumPy arrays are converted to lists of native Python values
+    value_columns = [
+        column.tolist() if hasattr(column, 'tolist') and not isinstance(column, array.array) else column
+        for column in value_columns
+    ]
+    constructor = GenericFieldInspector.get_constructor(dst_cls, tuple(init_names))
+    return map(constructor, zip(*value_columns))
+
+
+def _iter_comparisons(
+        objs_a: Iterable[Any], objs_b: Iterable[Any], exclude_names: StrCollection,
+) -> Iterator[Tuple[FieldComparison, Any, Any]]:
+    comparison = None  # type: Optional[FieldComparison]
+    a_cls = b_cls = None  # type: Optional[type]
+    varying = False
+    for a, b in zip(objs_a, objs_b):
+        if comparison is None or type(a) is not a_cls or type(b) is not b_cls or varying:
+            comparison = _get_comparison_for(a, b, exclude_names=exclude_names)
+            a_cls, b_cls = type(a), type(b)
+            varying = (
+                GenericFieldInspector.fields_vary_by_instance(a_cls)
+                or GenericFieldInspector.fields_vary_by_instance(b_cls)
+            )
+        yield comparison, a, b
+
+
+def diff_many(
+        objs_a: Iterable[Any], objs_b: Iterable[Any],
+        exclude_names: StrCollection = (),
+) -> Iterator[Dict[str, Tuple[Any, Any]]]:
+    """
+    Lazily compare fielded objects of ``objs_a`` and ``objs_b`` pairwise.
+    Iteration stops with the shorter iterable.
+    See :func:`~classical.fields.functions.diff`
+
+    :param objs_a: iterable of fielded objects
+    :param objs_b: iterable of fielded objects
+    :param exclude_names: field names to omit from the comparison
+    :return: iterator of dicts of field name -> ``(a_value, b_value)`` for fields with different values
+
+    ::
+
+        for model, changes in zip(models, diff_many(models, dtos)):
+            if changes:
+                update(model, changes)
+
+    """
+    for comparison, a, b in _iter_comparisons(objs_a, objs_b, exclude_names):
+        yield comparison.diff(a, b)
+
+
+def fields_equal_many(
+        objs_a: Iterable[Any], objs_b: Iterable[Any],
+        exclude_names: StrCollection = (),
+) -> Iterator[bool]:
+    """
+    Same as :func:`~classical.fields.bulk.diff_many`, but yields ``True``
+    for pairs of objects with equal fields and ``False`` otherwise.
+    See :func:`~classical.fields.functions.fields_equal`
+    """
+    for comparison, a, b in _iter_comparisons(objs_a, objs_b, exclude_names):
+        yield comparison.equal(a, b)
@@ -1,27 +1,86 @@
-from typing import Any
+import functools
+import operator
+from typing import AbstractSet, Any, Callable, FrozenSet, Iterable, List, Tuple
 
-from classical.fields.base import ClassField, FieldInspector, FieldSchema
+from classical.fields.base import ClassField, FieldInspector, FieldSchema, _make_tuple_getter
+
+
+class DictFieldSchema(FieldSchema[ClassField]):
+    """
+    Field schema of a dict, values are accessed by key.
+    """
+
+    _set_value = staticmethod(operator.setitem)
+
+    def __init__(self, fields: Iterable[ClassField] = (), optional_names: AbstractSet[str] = frozenset()):
+        super().__init__(fields)
+        self.optional_names = frozenset(optional_names)
+
+    def __reduce__(self):
+        return type(self), (list(self), self.optional_names)
+
+    def _derive(self, fields: Iterable[ClassField]) -> 'DictFieldSchema':
+        schema = type(self)(fields)
+        schema.optional_names = self.optional_names.intersection(schema.attr_names)
+        return schema.freeze()
+
+    def _make_value_getter(self) -> Callable[[Any], Tuple[Any, ...]]:
+        return _make_tuple_getter(operator.itemgetter, self.attr_names)
+
+
+# Maximum number of distinct key sequences with cached schemas
+KEY_SCHEMA_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=KEY_SCHEMA_CACHE_SIZE)
+def get_key_schema(keys: Tuple[str, ...]) -> DictFieldSchema:
+    """
+    Return the (cached) schema of dicts with the given keys.
+
+    :param keys: keys in the order of the dict's iteration
+    :return: schema with a field per key
+    """
+    return DictFieldSchema([ClassField(init_name=key, attr_name=key) for key in keys]).freeze()
+
+
+def _get_optional_names(insp_cls: type) -> FrozenSet[str]:
+    """
+    Return keys of a TypedDict that are not required
+    """
+    if hasattr(insp_cls, '__optional_keys__'):
+        # Python 3.9+, takes ``total`` of base classes and ``NotRequired`` into account
+        return frozenset(insp_cls.__optional_keys__)  # noqa
+    if getattr(insp_cls, '__total__', True):
+        return frozenset()
+    return frozenset(insp_cls.__annotations__)  # noqa
 
 
 class DictFieldInspector(FieldInspector[ClassField]):
+    _fields_vary_by_instance = True
+
+    priority = 50
+
     @classmethod
-    def _validate_cls(cls, insp_cls: type) -> None:
-        if not (issubclass(insp_cls, dict)):
-            cls._raise_unsupported_field_class(insp_cls=insp_cls)
+    def _matches(cls, insp_cls: type) -> bool:
+        return issubclass(insp_cls, dict)
 
     @classmethod
-    def _get_class_fields(cls, insp_cls: type) -> FieldSchema[ClassField]:
+    def _get_class_fields(cls, insp_cls: type) -> DictFieldSchema:
         cls._validate_cls(insp_cls)
-        result = FieldSchema()
+        result = []  # type: List[ClassField]
         if hasattr(insp_cls, '__annotations__'):
             # TypedDict
             for name in insp_cls.__annotations__:  # noqa
                 result.append(ClassField(init_name=name, attr_name=name))
-        return result
+            return DictFieldSchema(result, optional_names=_get_optional_names(insp_cls))
+        return DictFieldSchema(result)
+
+    @classmethod
+    def get_constructor(
+            cls, insp_cls: type, init_names: Tuple[str, ...],
+    ) -> Callable[[Tuple[Any, ...]], Any]:
+        return lambda values: insp_cls(zip(init_names, values))
 
     @classmethod
-    def _get_instance_fields(cls, obj: Any) -> FieldSchema[ClassField]:
-        return FieldSchema([
-            ClassField(attr_name=name, init_name=name)
-            for name in obj
-        ])
+    def _get_instance_fields(cls, obj: Any) -> DictFieldSchema:
+        return get_key_schema(tuple(obj))
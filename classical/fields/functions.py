@@ -1,7 +1,11 @@
-from typing import AbstractSet, Any, Dict, List, Optional, Set, Tuple, Type, Union
+import functools
+import operator
+import time
+from typing import AbstractSet, Any, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, Tuple, Type, Union
 
-from classical.fields.base import ClassField
-from classical.fields.generic import GenericFieldInspector
+from classical import metrics
+from classical.fields.base import ClassField, FieldSchema
+from classical.fields.generic import GenericFieldInspector, _register_plan_cache
 
 
 # typing.Collection is not supported by Python 3.5
@@ -45,10 +49,17 @@ def get_name_list(
 
 
 def _strip_excludes(
-        _fields: List[ClassField],
+        _fields: FieldSchema[ClassField],
         exclude_names: StrCollection = ()
-) -> Set[ClassField]:
-    return {f for f in _fields if f.name not in exclude_names}
+) -> Dict[ClassField, ClassField]:
+    # fields equal to the schema's fields may have a different ``index``,
+    # so the schema's own instances are kept as values
+    return {field: field for field in _fields.exclude(exclude_names)}
+
+
+def _get_key_set_fingerprint(key_set: FrozenSet[str]) -> FrozenSet[ClassField]:
+    # fields of a dict are named after its keys
+    return frozenset(ClassField(init_name=key, attr_name=key) for key in key_set)
 
 
 def are_analogous(*objs: Any, exclude_names: StrCollection = ()) -> bool:
@@ -57,21 +68,320 @@ def are_analogous(*objs: Any, exclude_names: StrCollection = ()) -> bool:
     :param objs: fielded objects
     :param exclude_names: field names to omit from the comparison
     :return: ``True`` if fields are the same for all objects, ``False`` otherwise
+
+    Schema fingerprints are compared once per distinct class,
+    dicts are compared by their key sets.
     """
     if not objs:
         return True
 
-    exclude_names = set(exclude_names)
+    exclude_names = frozenset(exclude_names)
+
+    fingerprints = set()  # type: Set[FrozenSet[ClassField]]
+    key_sets = set()  # type: Set[FrozenSet[str]]
+    # class -> fingerprint, or None if fields vary by instance
+    class_fingerprints = {}  # type: Dict[type, Optional[FrozenSet[ClassField]]]
+    for obj in objs:
+        if isinstance(obj, type):
+            fingerprints.add(get_fields(obj).get_fingerprint(exclude_names))
+        else:
+            obj_cls = type(obj)
+            if obj_cls in class_fingerprints:
+                fingerprint = class_fingerprints[obj_cls]
+            else:
+                fingerprint = None
+                if not GenericFieldInspector.fields_vary_by_instance(obj_cls):
+                    fingerprint = get_fields(obj_cls).get_fingerprint(exclude_names)
+                class_fingerprints[obj_cls] = fingerprint
+
+            if fingerprint is not None:
+                fingerprints.add(fingerprint)
+            elif isinstance(obj, dict):
+                key_sets.add(frozenset(obj.keys()) - exclude_names)
+                if len(key_sets) > 1:
+                    return False
+            else:
+                fingerprints.add(get_fields(obj).get_fingerprint(exclude_names))
 
-    standard_fields = _strip_excludes(
-        get_fields(objs[0]), exclude_names=exclude_names)
-    for other_obj in objs[1:]:
-        other_fields = _strip_excludes(
-            get_fields(other_obj), exclude_names=exclude_names)
-        if other_fields != standard_fields:
+        if len(fingerprints) > 1:
             return False
 
-    return True
+    fingerprints.update(map(_get_key_set_fingerprint, key_sets))
+    return len(fingerprints) == 1
+
+
+class Converter:
+    """
+    Reusable converter of fielded instances of ``src_cls``
+    to instances of fielded class ``dst_cls``.
+
+    Field compatibility is validated once when the converter is created
+    (see :func:`~classical.fields.functions.make_converter`),
+    so calling it only copies the values.
+    """
+
+    __slots__ = ('src_cls', 'dst_cls', 'defaults', '_src_schema', '_init_names', '_constructor')
+
+    def __init__(
+            self, src_cls: Type, dst_cls: Type,
+            src_schema: FieldSchema[ClassField],
+            init_names: Tuple[str, ...],
+            defaults: Optional[Dict[str, Any]] = None,
+    ):
+        self.src_cls = src_cls
+        self.dst_cls = dst_cls
+        self.defaults = defaults or {}  # type: Dict[str, Any]
+        self._src_schema = src_schema
+        self._init_names = init_names
+        # used when there are no defaults, e.g. ``_make`` of namedtuples
+        self._constructor = GenericFieldInspector.get_constructor(dst_cls, init_names)
+
+    def _construct(self, values: Iterable[Any], defaults: Optional[Dict[str, Any]]) -> Any:
+        if not defaults:
+            return self._constructor(values)
+        init_dict = dict(defaults)  # type: Dict[str, Any]
+        init_dict.update(zip(self._init_names, values))
+        return self.dst_cls(**init_dict)
+
+    def _convert(self, src: Any, defaults: Optional[Dict[str, Any]]) -> Any:
+        return self._construct(self._src_schema.get_values(src), defaults)
+
+    def __call__(self, src: Any) -> Any:
+        """
+        Create instance of ``dst_cls`` by copying values from ``src``
+        """
+        return self._convert(src, self.defaults)
+
+
+def _is_missing(field: ClassField, dst_schema: FieldSchema[ClassField], provided_names: AbstractSet[str]) -> bool:
+    """
+    Check whether a field of ``dst_schema`` that is not copied is missing,
+    i.e. it is required and gets no value from ``provided_names`` (defaults and copied fields)
+    """
+    return field.name not in provided_names and field.name not in dst_schema.optional_names
+
+
+def _build_converter(
+        src_cls: Type, src_schema: FieldSchema[ClassField], dst_cls: Type,
+        exclude_names: FrozenSet[str],
+        ignore_extra: bool,
+        ignore_missing: bool,
+        default_names: FrozenSet[str],
+) -> Converter:
+    src_fields = _strip_excludes(src_schema, exclude_names=exclude_names)
+    init_names = set(default_names)
+    copied_fields = []  # type: List[ClassField]
+    missing_field_names = []  # type: List[str]
+    dst_schema = get_fields(dst_cls)
+    for field in dst_schema.exclude(exclude_names):
+        if field in src_fields:
+            copied_fields.append(src_fields.pop(field))
+            init_names.add(field.init_name)
+        else:
+            if not ignore_missing and _is_missing(field, dst_schema, init_names):
+                missing_field_names.append(field.name)
+
+    if missing_field_names:
+        raise ValueError('Missing field: {}'.format(missing_field_names))
+
+    if src_fields and not ignore_extra:
+        raise ValueError('Extra fields {}'.format(
+            [field.name for field in src_schema if field in src_fields]))
+
+    return Converter(
+        src_cls=src_cls, dst_cls=dst_cls,
+        # use the source schema's type to keep its value access method
+        src_schema=type(src_schema)(copied_fields),
+        init_names=tuple(field.init_name for field in copied_fields),
+    )
+
+
+def make_converter(
+        src_cls: Type, dst_cls: Type,
+        exclude_names: StrCollection = (),
+        ignore_extra: bool = False,
+        ignore_missing: bool = False,
+        defaults: Optional[Dict[str, Any]] = None,
+) -> Converter:
+    """
+    Create a reusable converter of instances of fielded class ``src_cls``
+    to instances of fielded class ``dst_cls``.
+    Arguments have the same meaning as for :func:`~classical.fields.functions.copy_to_class`
+
+    :param src_cls: source class
+    :param dst_cls: destination class
+    :param exclude_names: field names to omit from the copy procedure
+    :param ignore_extra: ignore extra fields in source; default is ``False``
+    :param ignore_missing: ignore fields missing in source; default is ``False``
+    :param defaults: default values for missing fields
+    :return: callable that takes a source object and returns a ``dst_cls`` instance
+
+    ::
+
+        to_dto = make_converter(UserModel, UserDTO, exclude_names=('password',))
+        dtos = [to_dto(user) for user in users]
+
+    """
+    converter = _build_converter(
+        src_cls=src_cls, src_schema=get_fields(src_cls), dst_cls=dst_cls,
+        exclude_names=frozenset(exclude_names),
+        ignore_extra=ignore_extra, ignore_missing=ignore_missing,
+        default_names=frozenset(defaults or ()),
+    )
+    converter.defaults = dict(defaults or {})
+    return converter
+
+
+CONVERTER_CACHE_SIZE = 256
+
+
+def _get_schema_key(obj: Any) -> Tuple[type, Optional[Tuple[str, ...]]]:
+    """
+    Return a hashable key identifying the schema of ``obj``:
+    its class and, if fields vary by instance (e.g. dict keys), its field names.
+    """
+    obj_cls = type(obj)
+    if GenericFieldInspector.fields_vary_by_instance(obj_cls):
+        return obj_cls, get_fields(obj).attr_names
+    return obj_cls, None
+
+
+def _get_keyed_schema(obj_cls: Type, names: Optional[Tuple[str, ...]]) -> FieldSchema[ClassField]:
+    """
+    Return the schema identified by a key from :func:`_get_schema_key`
+    """
+    if names is None:
+        return get_fields(obj_cls)
+    schema = GenericFieldInspector.get_fields(obj_cls)
+    return type(schema)(ClassField(init_name=name, attr_name=name) for name in names)
+
+
+@_register_plan_cache
+@functools.lru_cache(maxsize=CONVERTER_CACHE_SIZE)
+def _get_cached_converter(
+        src_cls: Type, src_names: Optional[Tuple[str, ...]], dst_cls: Type,
+        exclude_names: FrozenSet[str],
+        ignore_extra: bool,
+        ignore_missing: bool,
+        default_names: FrozenSet[str],
+) -> Converter:
+    # fields of the source may depend on the instance
+    # (e.g. dict keys), so they are a part of the cache key
+    src_schema = _get_keyed_schema(src_cls, src_names)
+    measured = metrics.ENABLED
+    if measured:
+        start = time.perf_counter()
+    converter = _build_converter(
+        src_cls=src_cls, src_schema=src_schema, dst_cls=dst_cls,
+        exclude_names=exclude_names,
+        ignore_extra=ignore_extra, ignore_missing=ignore_missing,
+        default_names=default_names,
+    )
+    if measured:
+        metrics.record('fields.converter.build', duration=time.perf_counter() - start)
+    return converter
+
+
+def _get_converter_for(
+        src: Any, dst_cls: Type,
+        exclude_names: StrCollection = (),
+        ignore_extra: bool = False,
+        ignore_missing: bool = False,
+        defaults: Optional[Dict[str, Any]] = None,
+) -> Converter:
+    src_cls, src_names = _get_schema_key(src)
+    return _get_cached_converter(
+        src_cls, src_names, dst_cls,
+        frozenset(exclude_names), ignore_extra, ignore_missing,
+        frozenset(defaults) if defaults else frozenset(),
+    )
+
+
+# Containers whose items are converted by nested copying
+_CONTAINER_TYPES = frozenset({list, tuple, set, frozenset, dict})
+
+# Plan of a container node
+_CONTAINER_PLAN = (None, None)  # type: Tuple[Optional[Converter], Optional[Dict[str, Any]]]
+
+ClassMap = Mapping[type, Union[type, Converter]]
+
+
+def _get_nested_plan(
+        obj: Any, class_map: ClassMap,
+) -> Optional[Tuple[Optional[Converter], Optional[Dict[str, Any]]]]:
+    """
+    Return ``(converter, defaults)`` for a fielded object mapped in ``class_map``,
+    :data:`_CONTAINER_PLAN` for a container and ``None`` for a value that is copied as is.
+    """
+    obj_cls = type(obj)
+    mapped = class_map.get(obj_cls)
+    if mapped is not None:
+        if isinstance(mapped, Converter):
+            return mapped, mapped.defaults
+        return _get_converter_for(obj, mapped), None
+    if obj_cls in _CONTAINER_TYPES:
+        return _CONTAINER_PLAN
+    return None
+
+
+def _get_nested_children(obj: Any, converter: Optional[Converter]) -> Tuple[Any, ...]:
+    if converter is not None:
+        return converter._src_schema.get_values(obj)  # noqa
+    if type(obj) is dict:  # pylint: disable=unidiomatic-typecheck
+        return tuple(obj.values())
+    return tuple(obj)
+
+
+def _build_nested(
+        obj: Any, converter: Optional[Converter], defaults: Optional[Dict[str, Any]],
+        children: Tuple[Any, ...], converted: List[Any],
+) -> Any:
+    if converter is not None:
+        return converter._construct(converted, defaults)  # noqa
+    if all(map(operator.is_, converted, children)):
+        # nothing inside the container was converted
+        return obj
+    if type(obj) is dict:  # pylint: disable=unidiomatic-typecheck
+        return dict(zip(obj.keys(), converted))
+    return type(obj)(converted)
+
+
+def _copy_nested(
+        src: Any, converter: Converter, defaults: Optional[Dict[str, Any]], class_map: ClassMap,
+) -> Any:
+    """
+    Convert the object graph of ``src`` without recursion (post-order traversal).
+    Objects referenced several times are converted once.
+    """
+    # id of source object -> (source object, converted object);
+    # source objects are kept to make sure that ids are not reused
+    memo = {}  # type: Dict[int, Tuple[Any, Any]]
+    # ids of objects whose children are being converted, i.e. the current path
+    in_progress = set()  # type: Set[int]
+    # (object, converter, defaults, children or None if not expanded yet)
+    stack = [(src, converter, defaults, None)]  # type: List[Tuple[Any, Optional[Converter], Any, Any]]
+    while stack:
+        obj, obj_converter, obj_defaults, children = stack.pop()
+        key = id(obj)
+        if children is None:
+            if key in memo:
+                continue
+            if key in in_progress:
+                raise ValueError('Reference cycle through {} object'.format(type(obj).__name__))
+            children = _get_nested_children(obj, obj_converter)
+            in_progress.add(key)
+            stack.append((obj, obj_converter, obj_defaults, children))
+            for child in children:
+                if id(child) not in memo:
+                    plan = _get_nested_plan(child, class_map)
+                    if plan is not None:
+                        stack.append((child, plan[0], plan[1], None))
+        else:
+            converted = [memo[id(child)][1] if id(child) in memo else child for child in children]
+            memo[key] = obj, _build_nested(obj, obj_converter, obj_defaults, children, converted)
+            in_progress.discard(key)
+
+    return memo[id(src)][1]
 
 
 def copy_to_class(
@@ -80,7 +390,8 @@ def copy_to_class(
         ignore_extra: bool = False,
         ignore_missing: bool = False,
         defaults: Optional[Dict[str, Any]] = None,
-) -> None:
+        class_map: Optional[ClassMap] = None,
+) -> Any:
     """
     Create instance of fielded class ``dst_cls``
     by copying values from fielded instance ``src``
@@ -90,25 +401,128 @@ def copy_to_class(
     :param ignore_extra: ignore extra fields in source; default is ``False``
     :param ignore_missing: ignore fields missing in source; default is ``False``
     :param defaults: default values for missing fields
+    :param class_map: enables nested copying: dict of source class -> destination class
+        (or a converter created by :func:`~classical.fields.functions.make_converter`).
+        Field values that are instances of the source classes, including those inside
+        lists, tuples, sets and dict values, are converted as well.
+        The other arguments apply to ``src`` only.
+        Objects referenced several times are converted once,
+        reference cycles raise ``ValueError``
+
+    Conversion plans are cached for each combination of source and destination
+    classes and options (see :func:`~classical.fields.functions.make_converter`).
+
+    ::
+
+        copy_to_class(order_model, OrderDTO, class_map={ItemModel: ItemDTO})
+        # OrderDTO(id=1, items=[ItemDTO(...), ...])
+
     """
-    exclude_names = set(exclude_names)
+    measured = metrics.ENABLED
+    if measured:
+        start = time.perf_counter()
+    converter = _get_converter_for(
+        src, dst_cls, exclude_names=exclude_names,
+        ignore_extra=ignore_extra, ignore_missing=ignore_missing,
+        defaults=defaults,
+    )
+    if class_map:
+        result = _copy_nested(src, converter, defaults, class_map)
+    else:
+        result = converter._convert(src, defaults)  # noqa
+    if measured:
+        metrics.record('fields.copy_to_class', duration=time.perf_counter() - start)
+    return result
 
-    src_fields = _strip_excludes(get_fields(src), exclude_names=exclude_names)
-    dst_fields = _strip_excludes(get_fields(dst_cls), exclude_names=exclude_names)
-    init_dict = {**(defaults or {})}  # type: Dict[str, Any]
-    missing_field_names = []  # type: List[str]
-    for field in dst_fields:
-        if field in src_fields:
-            init_dict[field.init_name] = field[src]
-            src_fields.remove(field)
-        else:
-            if not ignore_missing and field.name not in init_dict:
-                missing_field_names.append(field.name)
 
-    if missing_field_names:
-        raise ValueError('Missing field: {}'.format(missing_field_names))
+class FieldComparison:
+    """
+    Reusable field-wise comparison of instances of two fielded classes.
 
-    if src_fields and not ignore_extra:
-        raise ValueError('Extra fields {}'.format([field.name for field in src_fields]))
+    Only the fields common to both classes are compared
+    (fields are matched by both ``init_name`` and ``attr_name``),
+    ``ValueError`` is raised if the classes have fields but none in common.
+    """
+
+    __slots__ = ('attr_names', '_a_schema', '_b_schema')
+
+    def __init__(self, a_schema: FieldSchema[ClassField], b_schema: FieldSchema[ClassField]):
+        b_fields = _strip_excludes(b_schema)
+        common_fields = [field for field in a_schema if field in b_fields]
+        if not common_fields and (a_schema or b_schema):
+            raise ValueError('No common fields: {} and {}'.format(list(a_schema.attr_names), list(b_schema.attr_names)))
+        self.attr_names = tuple(field.attr_name for field in common_fields)  # type: Tuple[str, ...]
+        # keep each schema's type and fields to keep their value access method
+        self._a_schema = type(a_schema)(common_fields)
+        self._b_schema = type(b_schema)(b_fields[field] for field in common_fields)
+
+    def diff(self, a: Any, b: Any) -> Dict[str, Tuple[Any, Any]]:
+        """
+        Return dict of attribute name -> ``(a_value, b_value)`` of fields that differ
+        """
+        a_values = self._a_schema.get_values(a)
+        b_values = self._b_schema.get_values(b)
+        if a_values == b_values:
+            return {}
+        return {
+            name: (a_value, b_value)
+            for name, a_value, b_value in zip(self.attr_names, a_values, b_values)
+            if a_value != b_value
+        }
+
+    def equal(self, a: Any, b: Any) -> bool:
+        """
+        Return ``True`` if all compared fields of ``a`` and ``b`` are equal
+        """
+        # tuple comparison stops at the first difference
+        return self._a_schema.get_values(a) == self._b_schema.get_values(b)
+
+
+@_register_plan_cache
+@functools.lru_cache(maxsize=CONVERTER_CACHE_SIZE)
+def _get_cached_comparison(
+        a_key: Tuple[type, Optional[Tuple[str, ...]]],
+        b_key: Tuple[type, Optional[Tuple[str, ...]]],
+        exclude_names: FrozenSet[str],
+) -> FieldComparison:
+    return FieldComparison(
+        _get_keyed_schema(*a_key).exclude(exclude_names),
+        _get_keyed_schema(*b_key).exclude(exclude_names),
+    )
 
-    return dst_cls(**init_dict)
+
+def _get_comparison_for(a: Any, b: Any, exclude_names: StrCollection = ()) -> FieldComparison:
+    return _get_cached_comparison(_get_schema_key(a), _get_schema_key(b), frozenset(exclude_names))
+
+
+def diff(a: Any, b: Any, exclude_names: StrCollection = ()) -> Dict[str, Tuple[Any, Any]]:
+    """
+    Compare values of fields of two fielded objects, possibly of different classes.
+    Only fields present in both objects are compared,
+    fields present in only one of them are ignored;
+    ``ValueError`` is raised if the objects have fields but none in common.
+
+    :param a: fielded object
+    :param b: fielded object
+    :param exclude_names: field names to omit from the comparison
+    :return: dict of field name -> ``(a_value, b_value)`` for fields with different values
+
+    ::
+
+        diff(user_model, user_dto, exclude_names=('password',))
+        # {'email': ('old@example.com', 'new@example.com')}
+
+    Comparison plans are cached for each pair of classes.
+    """
+    return _get_comparison_for(a, b, exclude_names=exclude_names).diff(a, b)
+
+
+def fields_equal(a: Any, b: Any, exclude_names: StrCollection = ()) -> bool:
+    """
+    Check whether values of the fields common to two fielded objects are equal.
+    Arguments have the same meaning as for :func:`~classical.fields.functions.diff`,
+    fields present in only one of the objects are ignored.
+
+    :return: ``True`` if there are no differences, ``False`` otherwise
+    """
+    return _get_comparison_for(a, b, exclude_names=exclude_names).equal(a, b)
@@ -1,62 +1,322 @@
-from typing import Any, Optional, Type
+import importlib
+import sys
+import threading
+import time
+import weakref
+from typing import Any, Callable, List, NamedTuple, Optional, Sequence, Tuple, Type, TypeVar, Union
 
+from classical import metrics
 from classical.fields.base import ClassField, FieldInspector, FieldSchema
 from classical.fields.namedtuple import NamedTupleFieldInspector
-from classical.fields.dict import DictFieldInspector
+from classical.fields.dict import DictFieldInspector, get_key_schema
 from classical.fields.attrs import AttrsFieldInspector
 from classical.fields.dataclass import DataclassFieldInspector
 
-try:
-    from classical.fields.schematics import SchematicsFieldInspector
-except ImportError:
-    SchematicsFieldInspector = None
-
-try:
-    from classical.fields.sqlalchemy import SQLAlchemyModelFieldInspector
-except ImportError:
-    SQLAlchemyModelFieldInspector = None
-
 
+# Inspectors that are ready to use, in the order of precedence
 INSPECTOR_REGISTRY = [
     cls for cls in (
         NamedTupleFieldInspector,
         DictFieldInspector,
         AttrsFieldInspector,
         DataclassFieldInspector,
-        SchematicsFieldInspector,
-        SQLAlchemyModelFieldInspector,
     ) if cls is not None
-]
+]  # type: List[Type[FieldInspector]]
+
+_CachedFunc = TypeVar('_CachedFunc', bound=Callable[..., Any])
+
+# Group of package entry points that provide third-party inspectors
+INSPECTOR_ENTRY_POINT_GROUP = 'classical.inspectors'
+
+
+class _LazyInspector:
+    """
+    Inspector that is imported on demand.
+    """
+
+    __slots__ = ('path', 'modules')
+
+    def __init__(self, path: str, modules: Sequence[str]):
+        self.path = path
+        self.modules = tuple(modules)
+
+    def is_triggered(self) -> bool:
+        # a class cannot belong to a library that has not been imported yet
+        return not self.modules or any(module in sys.modules for module in self.modules)
+
+    def load(self) -> Type[FieldInspector]:
+        module_name, _, attr_name = self.path.partition(':')
+        return getattr(importlib.import_module(module_name), attr_name)
+
+
+_PENDING_INSPECTORS = [
+    _LazyInspector('classical.fields.schematics:SchematicsFieldInspector', modules=('schematics',)),
+    _LazyInspector('classical.fields.sqlalchemy:SQLAlchemyModelFieldInspector', modules=('sqlalchemy',)),
+]  # type: List[_LazyInspector]
+
+_registry_lock = threading.RLock()
+_entry_points_loaded = False
+
+# ``lru_cache``-wrapped functions that cache plans built from field schemas
+# (e.g. converters), cleared together with the per-class inspection cache
+_PLAN_CACHES = []  # type: List[Any]
+
+
+def _register_plan_cache(cached_func: _CachedFunc) -> _CachedFunc:
+    """
+    Decorator for ``lru_cache``-wrapped functions whose results depend on field schemas,
+    so that :func:`GenericFieldInspector.cache_clear` clears them too
+    """
+    _PLAN_CACHES.append(cached_func)
+    return cached_func
+
+
+def register_inspector(
+        inspector: Union[Type[FieldInspector], str],
+        modules: Sequence[str] = (),
+) -> None:
+    """
+    Register a field inspector for use by
+    :class:`~classical.fields.generic.GenericFieldInspector`.
+
+    Inspectors are tried in the order of their ``priority``
+    (built-in inspectors have priorities from 10 to 60, the default is 0),
+    and in the order of registration for equal priorities.
+
+    :param inspector: inspector class or its import path (``'package.module:ClassName'``)
+        for the inspector to be imported lazily
+    :param modules: names of modules of the library the inspector supports;
+        a lazy inspector is imported only after one of them has been imported
+        (otherwise, when it is needed for the first time)
+
+    ::
+
+        register_inspector('my_orm_classical:MyORMFieldInspector', modules=('my_orm',))
+
+    Third-party packages can also provide inspectors via the
+    ``classical.inspectors`` entry point group (loaded when a class
+    is inspected for the first time).
+    """
+    with _registry_lock:
+        if isinstance(inspector, str):
+            _PENDING_INSPECTORS.append(_LazyInspector(inspector, modules=modules))
+        elif inspector not in INSPECTOR_REGISTRY:
+            INSPECTOR_REGISTRY.append(inspector)
+    GenericFieldInspector.cache_clear()
+
+
+def _iter_entry_point_paths() -> List[str]:
+    try:
+        from importlib.metadata import entry_points  # New in Python 3.8
+    except ImportError:
+        return []
+
+    eps = entry_points()
+    if hasattr(eps, 'select'):  # Python 3.10+
+        group = eps.select(group=INSPECTOR_ENTRY_POINT_GROUP)
+    else:
+        group = eps.get(INSPECTOR_ENTRY_POINT_GROUP, [])
+    return [ep.value for ep in group]
+
+
+def _load_pending_inspectors() -> None:
+    """
+    Import lazy inspectors whose libraries have already been imported
+    (and discover inspectors from entry points the first time).
+    """
+    global _entry_points_loaded  # pylint: disable=global-statement
+
+    with _registry_lock:
+        if not _entry_points_loaded:
+            _entry_points_loaded = True
+            for path in _iter_entry_point_paths():
+                _PENDING_INSPECTORS.append(_LazyInspector(path, modules=()))
+
+        for lazy_inspector in list(_PENDING_INSPECTORS):
+            if not lazy_inspector.is_triggered():
+                continue
+            _PENDING_INSPECTORS.remove(lazy_inspector)
+            try:
+                inspector_cls = lazy_inspector.load()
+            except ImportError:
+                continue
+            if inspector_cls not in INSPECTOR_REGISTRY:
+                INSPECTOR_REGISTRY.append(inspector_cls)
+
+
+def _get_negative_priority(inspector_cls: Type[FieldInspector]) -> int:
+    return -inspector_cls.priority
+
+
+def __getattr__(name: str) -> Any:
+    # backward compatibility for backend inspectors that used to be imported eagerly
+    if name in ('SchematicsFieldInspector', 'SQLAlchemyModelFieldInspector'):
+        try:
+            module = importlib.import_module('classical.fields.{}'.format(
+                'schematics' if name == 'SchematicsFieldInspector' else 'sqlalchemy'))
+        except ImportError:
+            return None
+        return getattr(module, name)
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+CacheInfo = NamedTuple('CacheInfo', (('hits', int), ('misses', int), ('currsize', int)))
+
+
+class _ClassCacheEntry:
+    """
+    Cached inspection results for a single class.
+    """
+
+    __slots__ = ('inspector_cls', 'schema')
+
+    def __init__(self, inspector_cls: Optional[Type[FieldInspector]]):
+        self.inspector_cls = inspector_cls
+        self.schema = None  # type: Optional[FieldSchema[ClassField]]
+
+
+class _ClassCache:
+    """
+    Per-class cache of resolved inspectors and field schemas.
+
+    Classes are referenced weakly, so entries disappear
+    when the inspected classes are garbage-collected.
+    """
+
+    def __init__(self):
+        self._entries = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, insp_cls: type) -> _ClassCacheEntry:
+        try:
+            entry = self._entries[insp_cls]
+        except KeyError:
+            self.misses += 1
+            if metrics.ENABLED:
+                start = time.perf_counter()
+                inspector_cls = GenericFieldInspector._resolve_specific_inspector_cls(insp_cls)
+                metrics.record('fields.inspector_cache.miss')
+                metrics.record('fields.inspector.resolve', duration=time.perf_counter() - start)
+            else:
+                inspector_cls = GenericFieldInspector._resolve_specific_inspector_cls(insp_cls)
+            entry = _ClassCacheEntry(inspector_cls=inspector_cls)
+            self._entries[insp_cls] = entry
+        else:
+            self.hits += 1
+            if metrics.ENABLED:
+                metrics.record('fields.inspector_cache.hit')
+        return entry
+
+    @staticmethod
+    def get_schema(entry: _ClassCacheEntry, insp_cls: type) -> FieldSchema[ClassField]:
+        if entry.schema is None:
+            if metrics.ENABLED:
+                start = time.perf_counter()
+                entry.schema = entry.inspector_cls._get_class_fields(insp_cls=insp_cls).freeze()
+                metrics.record('fields.schema.build', duration=time.perf_counter() - start)
+            else:
+                entry.schema = entry.inspector_cls._get_class_fields(insp_cls=insp_cls).freeze()
+        return entry.schema
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(hits=self.hits, misses=self.misses, currsize=len(self._entries))
+
+    def clear(self, insp_cls: Optional[type] = None) -> None:
+        if insp_cls is None:
+            self._entries.clear()
+            self.hits = self.misses = 0
+        else:
+            self._entries.pop(insp_cls, None)
+
+
+_CLASS_CACHE = _ClassCache()
 
 
 class GenericFieldInspector(FieldInspector[ClassField]):
     @classmethod
     def _resolve_specific_inspector_cls(cls, insp_cls: type) -> Optional[Type[FieldInspector]]:
-        for inspector_cls in INSPECTOR_REGISTRY:
-            try:
-                inspector_cls._validate_cls(insp_cls)
+        # lazy inspectors of imported libraries compete with the loaded ones by priority
+        _load_pending_inspectors()
+        # sorting is stable, so inspectors with equal priorities keep the registration order
+        for inspector_cls in sorted(INSPECTOR_REGISTRY, key=_get_negative_priority):
+            if inspector_cls._matches(insp_cls):
                 return inspector_cls
-            except TypeError:
-                pass
-
         return None
 
     @classmethod
-    def _validate_cls(cls, insp_cls: type) -> None:
-        inspector_cls = cls._resolve_specific_inspector_cls(insp_cls)
-        if inspector_cls is None:
+    def _get_cache_entry(cls, insp_cls: type) -> _ClassCacheEntry:
+        entry = _CLASS_CACHE.get(insp_cls)
+        if entry.inspector_cls is None:
             cls._raise_unsupported_field_class(insp_cls=insp_cls)
+        return entry
+
+    @classmethod
+    def fields_vary_by_instance(cls, insp_cls: type) -> bool:
+        """
+        Check whether instances of ``insp_cls`` can have different fields
+        (e.g. dicts), so their fields cannot be determined by the class alone.
+
+        :param insp_cls: fielded class
+        :return: ``True`` if the fields depend on the instance
+        """
+        return cls._get_cache_entry(insp_cls).inspector_cls._fields_vary_by_instance
+
+    @classmethod
+    def cache_info(cls) -> CacheInfo:
+        """
+        Return statistics of the per-class inspection cache.
+
+        :return: named tuple of ``hits``, ``misses`` and ``currsize``
+        """
+        return _CLASS_CACHE.info()
+
+    @classmethod
+    def cache_clear(cls, insp_cls: Optional[type] = None) -> None:
+        """
+        Invalidate the per-class inspection cache
+        and the cached conversion and comparison plans built from it.
+
+        Should be called after ``INSPECTOR_REGISTRY`` is modified directly
+        or when a class's fields are redefined.
+
+        :param insp_cls: class to invalidate; if omitted, the whole cache is cleared
+            (plans are always cleared entirely)
+        """
+        _CLASS_CACHE.clear(insp_cls)
+        for plan_cache in _PLAN_CACHES:
+            plan_cache.cache_clear()
+
+    @classmethod
+    def _validate_cls(cls, insp_cls: type) -> None:
+        cls._get_cache_entry(insp_cls)
 
     @classmethod
     def _get_class_fields(cls, insp_cls: type) -> FieldSchema[ClassField]:
-        inspector_cls = cls._resolve_specific_inspector_cls(insp_cls)
-        if inspector_cls is None:
-            cls._raise_unsupported_field_class(insp_cls=insp_cls)
-        return inspector_cls._get_class_fields(insp_cls=insp_cls)
+        entry = cls._get_cache_entry(insp_cls)
+        return _CLASS_CACHE.get_schema(entry, insp_cls)
 
     @classmethod
     def _get_instance_fields(cls, obj: Any) -> FieldSchema[ClassField]:
-        inspector_cls = cls._resolve_specific_inspector_cls(type(obj))
-        if inspector_cls is None:
-            cls._raise_unsupported_field_class(insp_cls=type(obj))
-        return inspector_cls._get_instance_fields(obj=obj)
+        insp_cls = type(obj)
+        if insp_cls is dict:
+            # fast path for plain dicts, their schemas are cached by keys
+            return get_key_schema(tuple(obj))
+        entry = cls._get_cache_entry(insp_cls)
+        if entry.inspector_cls._fields_vary_by_instance:
+            return entry.inspector_cls._get_instance_fields(obj=obj)
+        return _CLASS_CACHE.get_schema(entry, insp_cls)
+
+    @classmethod
+    def get_constructor(
+            cls, insp_cls: type, init_names: Tuple[str, ...],
+    ) -> Callable[[Tuple[Any, ...]], Any]:
+        inspector_cls = cls._get_cache_entry(insp_cls).inspector_cls
+        return inspector_cls.get_constructor(insp_cls, init_names)
+
+
+if sys.version_info < (3, 7):
+    # module ``__getattr__`` (PEP 562) is not supported, so the backend inspectors
+    # are imported eagerly (at the end of the module, they import ``GenericFieldInspector``)
+    SchematicsFieldInspector = __getattr__('SchematicsFieldInspector')
+    SQLAlchemyModelFieldInspector = __getattr__('SQLAlchemyModelFieldInspector')
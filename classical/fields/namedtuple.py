@@ -1,16 +1,52 @@
-from classical.fields.base import ClassField, FieldInspector, FieldSchema
+import operator
+from typing import Any, Callable, List, Tuple
+
+from classical.fields.base import ClassField, FieldInspector, FieldSchema, _make_tuple_getter
+
+
+class NamedTupleFieldSchema(FieldSchema[ClassField]):
+    """
+    Field schema of a namedtuple, values are accessed by index.
+    """
+
+    def _make_value_getter(self) -> Callable[[Any], Tuple[Any, ...]]:
+        indices = tuple(field.index for field in self)
+        if None in indices:
+            return super()._make_value_getter()
+        return _make_tuple_getter(operator.itemgetter, indices)
+
+
+def _has_generated_new(insp_cls: type) -> bool:
+    """
+    Check whether ``__new__`` of a namedtuple class is the one generated by ``namedtuple``,
+    ``_make`` bypasses ``__new__`` overridden by subclasses
+    """
+    for klass in insp_cls.__mro__:
+        if '__new__' in vars(klass):
+            # the generated class defines both
+            return '_make' in vars(klass)
+    return False
 
 
 class NamedTupleFieldInspector(FieldInspector[ClassField]):
+    priority = 60
+
     @classmethod
-    def _validate_cls(cls, insp_cls: type) -> None:
-        if not (issubclass(insp_cls, tuple) and hasattr(insp_cls, '_fields')):
-            cls._raise_unsupported_field_class(insp_cls=insp_cls)
+    def _matches(cls, insp_cls: type) -> bool:
+        return issubclass(insp_cls, tuple) and hasattr(insp_cls, '_fields')
 
     @classmethod
-    def _get_class_fields(cls, insp_cls: type) -> FieldSchema[ClassField]:
+    def _get_class_fields(cls, insp_cls: type) -> NamedTupleFieldSchema:
         cls._validate_cls(insp_cls)
-        result = FieldSchema()
-        for name in insp_cls._fields:  # noqa
-            result.append(ClassField(init_name=name, attr_name=name))
-        return result
+        result = []  # type: List[ClassField]
+        for index, name in enumerate(insp_cls._fields):  # noqa
+            result.append(ClassField(init_name=name, attr_name=name, index=index))
+        return NamedTupleFieldSchema(result)
+
+    @classmethod
+    def get_constructor(
+            cls, insp_cls: type, init_names: Tuple[str, ...],
+    ) -> Callable[[Tuple[Any, ...]], Any]:
+        if init_names == tuple(insp_cls._fields) and _has_generated_new(insp_cls):  # noqa
+            return insp_cls._make  # noqa
+        return super().get_constructor(insp_cls, init_names)
@@ -0,0 +1,166 @@
+"""
+Bulk conversion of fielded objects in a pool of worker processes
+"""
+
+import collections
+import concurrent.futures
+import itertools
+import os
+import sys
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Set, Type
+
+from classical.fields.bulk import ON_MISMATCH_ERROR, _iter_chunks, copy_many
+from classical.fields.functions import StrCollection, _get_converter_for
+
+
+# Inputs smaller than this are converted in the current process
+DEFAULT_SERIAL_THRESHOLD = 10000
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _build_plan(sample: Any, dst_cls: Type, options: Dict[str, Any]) -> None:
+    _get_converter_for(
+        sample, dst_cls,
+        exclude_names=options['exclude_names'],
+        ignore_extra=options['ignore_extra'],
+        ignore_missing=options['ignore_missing'],
+        defaults=options['defaults'],
+    )
+
+
+def _warm_up(sample: Any, dst_cls: Type, options: Dict[str, Any]) -> None:
+    """
+    Initializer of worker processes: build the conversion plan before the first chunk arrives.
+    Errors are ignored, a failing initializer would break the whole pool;
+    they are raised by the chunks' conversion instead.
+    """
+    try:
+        _build_plan(sample, dst_cls, options)
+    except Exception:  # pylint: disable=broad-except
+        pass
+
+
+def _convert_chunk(chunk: List[Any], dst_cls: Type, options: Dict[str, Any]) -> List[Any]:
+    return list(copy_many(chunk, dst_cls, **options))
+
+
+def copy_many_parallel(
+        srcs: Iterable[Any], dst_cls: Type,
+        workers: Optional[int] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        ordered: bool = True,
+        serial_threshold: int = DEFAULT_SERIAL_THRESHOLD,
+        executor: Optional[concurrent.futures.Executor] = None,
+        exclude_names: StrCollection = (),
+        ignore_extra: bool = False,
+        ignore_missing: bool = False,
+        defaults: Optional[Dict[str, Any]] = None,
+        on_mismatch: str = ON_MISMATCH_ERROR,
+) -> Iterator[Any]:
+    """
+    Lazily convert fielded objects from ``srcs`` to instances of ``dst_cls``
+    using a pool of worker processes.
+
+    Objects are sent to workers in chunks, so source objects, ``dst_cls``,
+    converted objects and ``defaults`` must be picklable.
+    Each chunk is converted with :func:`~classical.fields.bulk.copy_many`,
+    ``on_mismatch`` is applied to each chunk separately.
+    At most two chunks per worker are in flight at a time.
+
+    :param srcs: iterable of source objects
+    :param dst_cls: destination class
+    :param workers: number of worker processes; ``os.cpu_count()`` by default
+    :param chunk_size: number of objects sent to a worker at once
+    :param ordered: yield objects in the order of ``srcs`` (default);
+        otherwise chunks are yielded as soon as they are converted
+    :param serial_threshold: inputs with fewer objects are converted in the current process,
+        because inter-process communication would cost more than it saves
+    :param executor: existing executor to use instead of creating a process pool
+        (workers are not warmed up then)
+    :return: iterator of ``dst_cls`` instances
+
+    All other arguments have the same meaning as for :func:`~classical.fields.bulk.copy_many`
+    ::
+
+        dtos = list(copy_many_parallel(rows, UserDTO, workers=4))
+
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be positive')
+    options = dict(
+        exclude_names=exclude_names,
+        ignore_extra=ignore_extra, ignore_missing=ignore_missing,
+        defaults=defaults, on_mismatch=on_mismatch,
+    )
+
+    # validate ``on_mismatch`` before the iteration starts
+    copy_many((), dst_cls, **options)
+    return _copy_many_parallel(
+        srcs, dst_cls,
+        workers=workers, chunk_size=chunk_size, ordered=ordered,
+        serial_threshold=serial_threshold, executor=executor,
+        options=options,
+    )
+
+
+def _copy_many_parallel(
+        srcs: Iterable[Any], dst_cls: Type,
+        workers: Optional[int],
+        chunk_size: int,
+        ordered: bool,
+        serial_threshold: int,
+        executor: Optional[concurrent.futures.Executor],
+        options: Dict[str, Any],
+) -> Iterator[Any]:
+    iterator = iter(srcs)
+    # at least one object is needed to warm up the workers
+    head = list(itertools.islice(iterator, max(serial_threshold, 1)))
+    if len(head) < serial_threshold or not head or (workers == 1 and executor is None):
+        yield from copy_many(itertools.chain(head, iterator), dst_cls, **options)
+        return
+
+    sample = head[0]
+    # errors of the plan are raised here rather than in the workers
+    _build_plan(sample, dst_cls, options)
+    srcs = itertools.chain(head, iterator)
+
+    own_executor = executor is None
+    if own_executor:
+        workers = workers or os.cpu_count() or 1
+        pool_kwargs = {}  # type: Dict[str, Any]
+        if sys.version_info >= (3, 7):
+            # initializers are not supported by older versions,
+            # the plan is built by the first chunk then
+            pool_kwargs.update(initializer=_warm_up, initargs=(sample, dst_cls, options))
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers, **pool_kwargs)
+    max_pending = 2 * (workers or os.cpu_count() or 1)
+
+    chunks = _iter_chunks(srcs, chunk_size)
+    pending = collections.deque()  # type: Deque[concurrent.futures.Future]
+    not_done = set()  # type: Set[concurrent.futures.Future]
+    try:
+        for chunk in itertools.islice(chunks, max_pending):
+            pending.append(executor.submit(_convert_chunk, chunk, dst_cls, options))
+
+        if ordered:
+            while pending:
+                converted = pending.popleft().result()
+                for chunk in itertools.islice(chunks, 1):
+                    pending.append(executor.submit(_convert_chunk, chunk, dst_cls, options))
+                yield from converted
+        else:
+            not_done.update(pending)
+            pending.clear()
+            while not_done:
+                done, not_done = concurrent.futures.wait(
+                    not_done, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    for chunk in itertools.islice(chunks, 1):
+                        not_done.add(executor.submit(_convert_chunk, chunk, dst_cls, options))
+                    yield from future.result()
+    finally:
+        for future in itertools.chain(pending, not_done):
+            future.cancel()
+        if own_executor:
+            executor.shutdown(wait=True)
@@ -1,18 +1,21 @@
 import schematics
 
+from typing import List
+
 from classical.fields.base import ClassField, FieldInspector, FieldSchema
 
 
 class SchematicsFieldInspector(FieldInspector[ClassField]):
+    priority = 20
+
     @classmethod
-    def _validate_cls(cls, insp_cls: type) -> None:
-        if not issubclass(insp_cls, schematics.Model):
-            cls._raise_unsupported_field_class(insp_cls=insp_cls)
+    def _matches(cls, insp_cls: type) -> bool:
+        return issubclass(insp_cls, schematics.Model)
 
     @classmethod
     def _get_class_fields(cls, insp_cls: type) -> FieldSchema[ClassField]:
         cls._validate_cls(insp_cls)
-        result = FieldSchema()
+        result = []  # type: List[ClassField]
         for name in insp_cls._schema.fields:  # noqa
             result.append(ClassField(init_name=name, attr_name=name))
-        return result
+        return FieldSchema(result)
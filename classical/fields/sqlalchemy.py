@@ -1,22 +1,274 @@
+import functools
+import weakref
+from typing import (
+    AbstractSet, Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, Type,
+)
+
+import sqlalchemy
 import sqlalchemy.orm
-import sqlalchemy.orm.util
-import sqlalchemy.exc
 
 from classical.fields.base import ClassField, FieldInspector, FieldSchema
+from classical.fields.functions import _is_missing
+from classical.fields.generic import GenericFieldInspector, _register_plan_cache
+
+
+LAZY_LOAD_ALLOW = 'allow'
+LAZY_LOAD_SKIP = 'skip'
+LAZY_LOAD_RAISE = 'raise'
+
+_LAZY_LOAD_OPTIONS = (LAZY_LOAD_ALLOW, LAZY_LOAD_SKIP, LAZY_LOAD_RAISE)
+
+
+def _get_unloaded_names(obj: Any) -> Optional[AbstractSet[str]]:
+    """
+    Return names of attributes that would be lazy-loaded on access,
+    ``None`` if the object was never persisted (so nothing can be loaded)
+    """
+    state = sqlalchemy.inspect(obj)
+    if not state.has_identity:
+        return None
+    return state.unloaded
+
+
+class RaiseOnLoadFieldSchema(FieldSchema[ClassField]):
+    """
+    Field schema of a model that raises ``ValueError``
+    instead of lazy-loading unloaded attributes.
+    """
+
+    def get_values(self, obj: Any) -> Tuple[Any, ...]:
+        unloaded = _get_unloaded_names(obj)
+        if unloaded and not unloaded.isdisjoint(self.attr_names):
+            raise ValueError('Unloaded fields: {}'.format(
+                [name for name in self.attr_names if name in unloaded]))
+        return super().get_values(obj)
+
+
+class _MapperFields:
+    """
+    Classification of attributes of a mapped class
+    """
+
+    __slots__ = ('all_names', 'column_names', 'schemas')
+
+    def __init__(self, mapper: sqlalchemy.orm.Mapper):
+        self.all_names = tuple(mapper.attrs.keys())  # type: Tuple[str, ...]
+        self.column_names = tuple(
+            prop.key for prop in mapper.attrs
+            if isinstance(prop, sqlalchemy.orm.ColumnProperty)
+        )  # type: Tuple[str, ...]
+        # (columns_only, schema class) -> schema
+        self.schemas = {}  # type: Dict[Tuple[bool, type], FieldSchema[ClassField]]
+
+
+# Mapped class -> classification of its attributes
+_MAPPER_FIELDS = weakref.WeakKeyDictionary()  # type: weakref.WeakKeyDictionary
 
 
 class SQLAlchemyModelFieldInspector(FieldInspector[ClassField]):
+    priority = 10
+
+    # Only include column attributes (no relationships, composites, etc.)
+    columns_only = False
+
+    # What to do with attributes of persisted instances that are not loaded:
+    # ``'allow'`` lazy-loads them on access,
+    # ``'skip'`` omits them from the instance's fields,
+    # ``'raise'`` raises ``ValueError`` when their values are read
+    lazy_load = LAZY_LOAD_ALLOW
+
+    @classmethod
+    def with_options(
+            cls, columns_only: bool = False,
+            lazy_load: str = LAZY_LOAD_ALLOW,
+            priority: Optional[int] = None,
+    ) -> 'Type[SQLAlchemyModelFieldInspector]':
+        """
+        Create a subclass of the inspector with the given options.
+        Register it with :func:`~classical.fields.generic.register_inspector`
+        to use it for all mapped classes.
+
+        :param columns_only: only include column attributes
+        :param lazy_load: what to do with unloaded attributes: ``'allow'``, ``'skip'`` or ``'raise'``
+        :param priority: priority of the new inspector; higher than the default one's by default
+        :return: inspector class
+
+        ::
+
+            register_inspector(SQLAlchemyModelFieldInspector.with_options(columns_only=True, lazy_load='skip'))
+
+        """
+        if lazy_load not in _LAZY_LOAD_OPTIONS:
+            raise ValueError('Invalid lazy_load value: {!r}, must be one of {}'.format(
+                lazy_load, _LAZY_LOAD_OPTIONS))
+        return type(cls.__name__, (cls,), dict(
+            columns_only=columns_only,
+            lazy_load=lazy_load,
+            priority=cls.priority + 1 if priority is None else priority,
+            _fields_vary_by_instance=lazy_load == LAZY_LOAD_SKIP,
+        ))
+
+    @classmethod
+    def _matches(cls, insp_cls: type) -> bool:
+        # unlike ``class_mapper``, doesn't raise or configure mappers for unmapped classes
+        return isinstance(sqlalchemy.inspect(insp_cls, raiseerr=False), sqlalchemy.orm.Mapper)
+
     @classmethod
-    def _validate_cls(cls, insp_cls: type) -> None:
-        try:
-            sqlalchemy.orm.util.class_mapper(insp_cls)
-        except sqlalchemy.orm.exc.UnmappedClassError:
-            cls._raise_unsupported_field_class(insp_cls=insp_cls)
+    def _get_mapper_fields(cls, insp_cls: type) -> _MapperFields:
+        mapper_fields = _MAPPER_FIELDS.get(insp_cls)
+        if mapper_fields is None:
+            cls._validate_cls(insp_cls)
+            mapper_fields = _MAPPER_FIELDS[insp_cls] = _MapperFields(insp_cls.__mapper__)  # noqa
+        return mapper_fields
 
     @classmethod
     def _get_class_fields(cls, insp_cls: type) -> FieldSchema[ClassField]:
-        cls._validate_cls(insp_cls)
-        result = FieldSchema()
-        for name in insp_cls.__mapper__.attrs.keys():  # noqa
-            result.append(ClassField(init_name=name, attr_name=name))
-        return result
+        mapper_fields = cls._get_mapper_fields(insp_cls)
+        schema_cls = RaiseOnLoadFieldSchema if cls.lazy_load == LAZY_LOAD_RAISE else FieldSchema
+        schema_key = (cls.columns_only, schema_cls)
+        schema = mapper_fields.schemas.get(schema_key)
+        if schema is None:
+            result = []  # type: List[ClassField]
+            for name in mapper_fields.column_names if cls.columns_only else mapper_fields.all_names:
+                result.append(ClassField(init_name=name, attr_name=name))
+            schema = mapper_fields.schemas[schema_key] = schema_cls(result).freeze()
+        return schema
+
+    @classmethod
+    def _get_instance_fields(cls, obj: Any) -> FieldSchema[ClassField]:
+        schema = cls._get_class_fields(type(obj))
+        if cls.lazy_load == LAZY_LOAD_SKIP:
+            unloaded = _get_unloaded_names(obj)
+            if unloaded:
+                # exclusions are cached by the schema
+                return schema.exclude(unloaded)
+        return schema
+
+
+class RowConverter:
+    """
+    Converter of rows of a Core ``select`` of a mapped class's columns
+    to instances of fielded class ``dst_cls``.
+
+    Only the columns needed by ``dst_cls`` are selected (see ``statement``),
+    rows are converted positionally, bypassing ORM instances.
+    Created by :func:`~classical.fields.sqlalchemy.make_row_converter`
+    """
+
+    __slots__ = ('model_cls', 'dst_cls', 'defaults', 'statement', '_init_names', '_constructor')
+
+    def __init__(
+            self, model_cls: type, dst_cls: type,
+            column_names: Tuple[str, ...],
+            init_names: Tuple[str, ...],
+            defaults: Optional[Dict[str, Any]] = None,
+    ):
+        self.model_cls = model_cls
+        self.dst_cls = dst_cls
+        self.defaults = defaults or {}  # type: Dict[str, Any]
+        columns = [getattr(model_cls, name) for name in column_names]
+        self.statement = sqlalchemy.select(columns) if _SELECT_TAKES_LIST else sqlalchemy.select(*columns)
+        self._init_names = init_names
+        self._constructor = GenericFieldInspector.get_constructor(dst_cls, init_names)
+
+    def __call__(self, row: Sequence[Any]) -> Any:
+        """
+        Create instance of ``dst_cls`` from a row of ``statement``
+        """
+        if not self.defaults:
+            return self._constructor(row)
+        init_dict = dict(self.defaults)  # type: Dict[str, Any]
+        init_dict.update(zip(self._init_names, row))
+        return self.dst_cls(**init_dict)
+
+    def stream(self, connection: Any, statement: Any = None, batch_size: int = 1000) -> Iterator[Any]:
+        """
+        Execute the statement and lazily convert its rows, fetching them in batches.
+
+        :param connection: connection or session
+        :param statement: statement derived from ``statement``,
+            e.g. ``converter.statement.where(...)``; ``statement`` by default
+        :param batch_size: number of rows fetched at once
+        :return: iterator of ``dst_cls`` instances
+
+        ::
+
+            converter = make_row_converter(UserModel, UserDTO)
+            for dto in converter.stream(connection, converter.statement.where(UserModel.active)):
+                send(dto)
+
+        """
+        result = connection.execute(self.statement if statement is None else statement)
+        for rows in iter(lambda: result.fetchmany(batch_size), []):
+            yield from map(self, rows)
+
+
+# ``select(*columns)`` is supported since SQLAlchemy 1.4
+_SELECT_TAKES_LIST = tuple(map(int, sqlalchemy.__version__.split('.')[:2])) < (1, 4)
+
+
+@_register_plan_cache
+@functools.lru_cache(maxsize=256)
+def _get_row_plan(
+        model_cls: type, dst_cls: type,
+        exclude_names: FrozenSet[str],
+        ignore_missing: bool,
+        default_names: FrozenSet[str],
+) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """
+    Return names of the model's columns to select and
+    ``init_name`` of the corresponding fields of ``dst_cls``
+    """
+    column_names = set(SQLAlchemyModelFieldInspector._get_mapper_fields(model_cls).column_names)  # noqa
+
+    selected_names = []  # type: List[str]
+    init_names = []  # type: List[str]
+    # same as in ``copy_to_class``: names of defaults and of copied fields
+    provided_names = set(default_names)  # type: Set[str]
+    missing_field_names = []  # type: List[str]
+    dst_schema = GenericFieldInspector.get_fields(dst_cls)
+    for field in dst_schema.exclude(exclude_names):
+        if field.attr_name in column_names and field.init_name == field.attr_name:
+            selected_names.append(field.attr_name)
+            init_names.append(field.init_name)
+            provided_names.add(field.init_name)
+        elif not ignore_missing and _is_missing(field, dst_schema, provided_names):
+            missing_field_names.append(field.name)
+
+    if missing_field_names:
+        raise ValueError('Missing field: {}'.format(missing_field_names))
+    return tuple(selected_names), tuple(init_names)
+
+
+def make_row_converter(
+        model_cls: type, dst_cls: type,
+        exclude_names: Iterable[str] = (),
+        ignore_missing: bool = False,
+        defaults: Optional[Dict[str, Any]] = None,
+) -> RowConverter:
+    """
+    Create a converter of rows of the mapped class ``model_cls``'s table
+    to instances of fielded class ``dst_cls``, selecting only the columns that ``dst_cls`` needs.
+    Arguments have the same meaning as for :func:`~classical.fields.functions.copy_to_class`,
+    fields of ``dst_cls`` match the model's column attributes with the same name.
+
+    :param model_cls: mapped class
+    :param dst_cls: destination class
+    :param exclude_names: field names to omit from the copy procedure
+    :param ignore_missing: ignore fields missing in the model; default is ``False``
+    :param defaults: default values for missing fields
+    :return: :class:`~classical.fields.sqlalchemy.RowConverter`
+
+    ::
+
+        converter = make_row_converter(UserModel, UserDTO)
+        dtos = list(converter.stream(session, converter.statement.where(UserModel.id < 100)))
+
+    """
+    column_names, init_names = _get_row_plan(
+        model_cls, dst_cls, frozenset(exclude_names), ignore_missing, frozenset(defaults or ()))
+    return RowConverter(
+        model_cls=model_cls, dst_cls=dst_cls,
+        column_names=column_names, init_names=init_names,
+        defaults=dict(defaults or {}),
+    )
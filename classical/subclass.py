@@ -2,7 +2,64 @@
 Tools for creating subclasses
 """
 
+import collections
+import sys
+import threading
 import types
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+
+
+# Attribute of generated ``__init__`` functions that stores their presets
+_INIT_PRESETS_ATTR = '_classical_init_presets'
+
+
+def _get_caller_module() -> str:
+    """
+    Return the name of the module that requested the subclass
+    (skipping the frames of ``classical`` itself).
+    This makes the subclass picklable by reference
+    when it is assigned to a module-level variable of the same name
+    (same as ``collections.namedtuple`` does).
+    """
+    try:
+        frame = sys._getframe(1)  # noqa
+    except (AttributeError, ValueError):
+        return '__main__'
+    while frame is not None:
+        module = frame.f_globals.get('__name__', '__main__')
+        if module != 'classical' and not module.startswith('classical.'):
+            return module
+        frame = frame.f_back
+    return '__main__'
+
+
+def _make_init(base: type, args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Callable:
+    """
+    Create an ``__init__`` that calls ``base.__init__``
+    with preset ``args`` and ``kwargs``.
+    The variants avoid merging empty presets on every instantiation.
+    """
+    if args and kwargs:
+        def new_init(self, *_args, **_kwargs):
+            if _kwargs:
+                base.__init__(self, *args, *_args, **dict(kwargs, **_kwargs))
+            else:
+                base.__init__(self, *args, *_args, **kwargs)
+    elif kwargs:
+        def new_init(self, *_args, **_kwargs):
+            if _kwargs:
+                base.__init__(self, *_args, **dict(kwargs, **_kwargs))
+            else:
+                base.__init__(self, *_args, **kwargs)
+    elif args:
+        def new_init(self, *_args, **_kwargs):
+            base.__init__(self, *args, *_args, **_kwargs)
+    else:
+        def new_init(self, *_args, **_kwargs):
+            base.__init__(self, *_args, **_kwargs)
+
+    setattr(new_init, _INIT_PRESETS_ATTR, (base, args, kwargs))
+    return new_init
 
 
 def argumented_subclass(cls: type, name: str, *args, **kwargs):
@@ -40,13 +97,28 @@ def argumented_subclass(cls: type, name: str, *args, **kwargs):
         Existence of ``__slots__``
         (and, consequently, the absence of the instance ``__dict__``)
         is preserved during subclassing
+
+    .. note::
+        The subclass's ``__module__`` is set to the calling module,
+        so the subclass (and its instances) can be pickled
+        if it is assigned to a module-level variable named ``name``
     """
-    def new_init(self, *_args, **_kwargs):
-        cls.__init__(self, *(args + _args), **dict(kwargs, **_kwargs))
+    presets = getattr(cls.__init__, _INIT_PRESETS_ATTR, None)
+    if presets is not None:
+        # ``cls`` is an argumented subclass itself,
+        # so its presets are merged into the new ones to avoid
+        # an extra call for each level of subclassing
+        base, base_args, base_kwargs = presets
+        new_init = _make_init(base, base_args + args, dict(base_kwargs, **kwargs))
+    else:
+        new_init = _make_init(cls, args, kwargs)
 
     new_init.__name__ = '__init__'
+    new_init.__qualname__ = '{}.__init__'.format(name)
+    module = _get_caller_module()
 
     def set_subclass_attrs(ns):
+        ns['__module__'] = module
         ns['__init__'] = new_init
         if hasattr(cls, '__slots__'):
             ns['__slots__'] = ()  # no new instance attributes, so empty slots
@@ -76,10 +148,125 @@ def attributed_subclass(cls: type, name: str, **attributes):
         Existence of ``__slots__``
         (and, consequently, the absence of the instance ``__dict__``)
         is preserved during subclassing
+
+    .. note::
+        The subclass's ``__module__`` is set to the calling module,
+        so the subclass (and its instances) can be pickled
+        if it is assigned to a module-level variable named ``name``
     """
+    module = _get_caller_module()
+
     def set_subclass_attrs(ns):
+        ns['__module__'] = module
         ns.update(attributes.items())
         if hasattr(cls, '__slots__'):
             ns['__slots__'] = ()  # no new instance attributes, so empty slots
 
     return types.new_class(name, (cls,), exec_body=set_subclass_attrs)
+
+
+SubclassCacheInfo = NamedTuple('SubclassCacheInfo', (
+    ('hits', int), ('misses', int), ('maxsize', Optional[int]), ('currsize', int),
+))
+
+
+def _typed_key(values: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    # distinguish equal values of different types (e.g. ``1`` and ``True``)
+    return values + tuple(type(value) for value in values)
+
+
+def _typed_items(items: Dict[str, Any]) -> Tuple[Tuple[str, Any, type], ...]:
+    # same as ``_typed_key`` for keyword arguments
+    return tuple((key, value, type(value)) for key, value in sorted(items.items()))
+
+
+class SubclassCache:
+    """
+    Interning cache for :func:`~classical.subclass.argumented_subclass`
+    and :func:`~classical.subclass.attributed_subclass`.
+
+    Returns the same subclass when called again with the same
+    (hashable) arguments instead of creating a new one.
+    Subclasses with unhashable arguments are created anew every time.
+
+    :param maxsize: maximum number of subclasses to keep;
+        the least recently used ones are discarded first.
+        ``None`` means unlimited
+
+    ::
+
+        cache = SubclassCache(maxsize=1000)
+        Red = cache.argumented_subclass(Square, 'Red', color='red')
+        Red is cache.argumented_subclass(Square, 'Red', color='red')  # True
+
+    The module-level ``interned`` instance can be shared,
+    e.g. as a factory for :class:`~classical.descriptors.FactoryProperty`.
+    """
+
+    def __init__(self, maxsize: Optional[int] = 128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._subclasses = collections.OrderedDict()  # type: collections.OrderedDict
+        self._lock = threading.RLock()
+
+    def _get_or_create(self, key: Hashable, create: Callable[[], type]) -> type:
+        try:
+            hash(key)
+        except TypeError:
+            # unhashable arguments
+            with self._lock:
+                self.misses += 1
+            return create()
+
+        with self._lock:
+            subclass = self._subclasses.get(key)
+            if subclass is not None:
+                self.hits += 1
+                self._subclasses.move_to_end(key)
+                return subclass
+
+            self.misses += 1
+            subclass = self._subclasses[key] = create()
+            if self.maxsize is not None:
+                while len(self._subclasses) > self.maxsize:
+                    self._subclasses.popitem(last=False)
+            return subclass
+
+    def argumented_subclass(self, cls: type, name: str, *args, **kwargs) -> type:
+        """
+        Interned version of :func:`~classical.subclass.argumented_subclass`
+        """
+        key = (
+            argumented_subclass, cls, name,
+            _typed_key(args), _typed_items(kwargs),
+        )
+        return self._get_or_create(key, lambda: argumented_subclass(cls, name, *args, **kwargs))
+
+    def attributed_subclass(self, cls: type, name: str, **attributes) -> type:
+        """
+        Interned version of :func:`~classical.subclass.attributed_subclass`
+        """
+        key = (attributed_subclass, cls, name, _typed_items(attributes))
+        return self._get_or_create(key, lambda: attributed_subclass(cls, name, **attributes))
+
+    def cache_info(self) -> SubclassCacheInfo:
+        """
+        Return statistics of the cache
+        """
+        with self._lock:
+            return SubclassCacheInfo(
+                hits=self.hits, misses=self.misses,
+                maxsize=self.maxsize, currsize=len(self._subclasses),
+            )
+
+    def cache_clear(self) -> None:
+        """
+        Discard all interned subclasses and reset the statistics
+        """
+        with self._lock:
+            self._subclasses.clear()
+            self.hits = self.misses = 0
+
+
+interned = SubclassCache()
@@ -0,0 +1,72 @@
+import asyncio
+import sys
+from collections import namedtuple
+
+import attr
+import pytest
+
+if sys.version_info < (3, 6):
+    pytest.skip('asynchronous generators require Python 3.6+', allow_module_level=True)
+
+from classical.fields.aio import acopy_many, acopy_many_chunked  # noqa  # pylint: disable=wrong-import-position
+
+
+FieldedNT = namedtuple('FieldedNT', ('size', 'color'))
+
+
+@attr.s
+class FieldedAttrs:
+    size = attr.ib()
+    color = attr.ib()
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+async def _collect(async_iterable):
+    return [item async for item in async_iterable]
+
+
+def _run(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def test_acopy_many():
+    srcs = [FieldedNT(size=i, color='red') for i in range(5)] + [{'size': 5, 'color': 'blue'}]
+    converted = _run(_collect(acopy_many(_aiter(srcs), FieldedAttrs, on_mismatch='replan', yield_every=2)))
+    assert converted == [FieldedAttrs(size=i, color='red') for i in range(5)] + [FieldedAttrs(size=5, color='blue')]
+
+    with pytest.raises(ValueError, match='Heterogeneous'):
+        _run(_collect(acopy_many(_aiter(srcs), FieldedAttrs)))
+
+
+def test_acopy_many_yields_to_loop():
+    ticks = []
+
+    async def ticker():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def convert():
+        task = asyncio.ensure_future(ticker())
+        srcs = [FieldedNT(size=i, color='red') for i in range(100)]
+        result = await _collect(acopy_many(_aiter(srcs), FieldedAttrs, yield_every=10))
+        task.cancel()
+        return result
+
+    assert len(_run(convert())) == 100
+    assert len(ticks) >= 10
+
+
+def test_acopy_many_chunked():
+    srcs = [FieldedNT(size=i, color='red') for i in range(5)]
+    chunks = _run(_collect(acopy_many_chunked(_aiter(srcs), FieldedAttrs, chunk_size=2)))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[-1] == [FieldedAttrs(size=4, color='red')]
@@ -0,0 +1,151 @@
+import pickle
+
+import attr
+import pytest
+
+from classical.fields.base import ClassField, FieldSchema
+from classical.fields.dict import DictFieldSchema
+
+
+@attr.s
+class FieldedAttrs:
+    size = attr.ib()
+    color = attr.ib()
+
+
+def test_get_values():
+    size = ClassField(init_name='size', attr_name='size')
+    color = ClassField(init_name='color', attr_name='color')
+    obj = FieldedAttrs(size=12, color='red')
+
+    assert FieldSchema([size, color]).get_values(obj) == (12, 'red')
+    assert FieldSchema([color]).get_values(obj) == ('red',)
+    assert FieldSchema().get_values(obj) == ()
+    assert DictFieldSchema([color]).get_values({'color': 'red'}) == ('red',)
+
+    # objects not matching the compiled getter fall back to per-field access
+    assert FieldSchema([size, color]).get_values({'size': 12, 'color': 'red'}) == (12, 'red')
+
+
+def test_get_name_dict():
+    field = ClassField(init_name='size', attr_name='_size')
+    schema = FieldSchema([field])
+
+    @attr.s
+    class PrivateAttrs:
+        _size = attr.ib()
+
+    obj = PrivateAttrs(size=12)
+    assert schema.get_name_dict(obj) == {'_size': 12}
+    assert schema.get_name_dict(obj, init_mode=True) == {'size': 12}
+    assert schema.get_field_dict(obj) == {field: 12}
+
+
+def test_set_field_dict():
+    size = ClassField(init_name='size', attr_name='size')
+    color = ClassField(init_name='color', attr_name='color')
+
+    obj = FieldedAttrs(size=12, color='red')
+    FieldSchema([size, color]).set_field_dict(obj, {size: 34})
+    assert obj == FieldedAttrs(size=34, color='red')
+
+    dict_obj = {'size': 12, 'color': 'red'}
+    DictFieldSchema([size, color])[dict_obj] = {color: 'blue'}
+    assert dict_obj == {'size': 12, 'color': 'blue'}
+
+    size.set_value(dict_obj, 56)
+    assert size.get_value(dict_obj) == 56
+
+
+def test_class_field_interning():
+    field = ClassField(init_name='size', attr_name='_size')
+    assert ClassField(init_name='size', attr_name='_size') is field
+    assert ClassField(init_name='size', attr_name='size') is not field
+    assert hash(field) == hash(('size', '_size'))
+    assert pickle.loads(pickle.dumps(field)) is field
+    with pytest.raises(AttributeError):
+        field.attr_name = 'size'
+
+    indexed_field = ClassField(init_name='size', attr_name='_size', index=1)
+    assert indexed_field is not field
+    assert indexed_field == field
+    assert hash(indexed_field) == hash(field)
+    assert pickle.loads(pickle.dumps(indexed_field)).index == 1
+
+    assert ClassField('size', '_size', 1) is indexed_field
+    with pytest.raises(TypeError):
+        ClassField('size', '_size', 1, int)
+
+
+class TypedField(ClassField):
+    __slots__ = ('type_',)
+
+    def __init__(self, init_name: str, attr_name: str, type_: type = object):
+        super().__init__(init_name=init_name, attr_name=attr_name)
+        object.__setattr__(self, 'type_', type_)
+
+
+def test_class_field_subclass():
+    int_field = TypedField('size', 'size', type_=int)
+    str_field = TypedField('size', 'size', type_=str)
+    assert int_field.type_ is int
+    assert str_field.type_ is str
+    assert int_field is not str_field
+    assert int_field == ClassField('size', 'size')
+
+
+def test_schema_indexes_and_projections():
+    size = ClassField(init_name='size', attr_name='_size')
+    color = ClassField(init_name='color', attr_name='color')
+    schema = FieldSchema([size, color])
+
+    assert schema.fields_by_attr_name == {'_size': size, 'color': color}
+    assert schema.fields_by_init_name == {'size': size, 'color': color}
+
+    projection = schema.project(['color', '_size'])
+    assert projection == [color, size]
+    assert schema.project(('color', '_size')) is projection
+    with pytest.raises(ValueError):
+        schema.project(['weight'])
+
+    exclusion = schema.exclude({'_size'})
+    assert exclusion == [color]
+    assert schema.exclude(['_size']) is exclusion
+    assert schema.exclude(()) is schema
+
+    assert type(DictFieldSchema([size, color]).exclude(['color'])) is DictFieldSchema
+
+
+def test_schema_built_by_appending():
+    # third-party inspectors build schemas with ``FieldSchema()`` and ``append``
+    size = ClassField(init_name='size', attr_name='size')
+    color = ClassField(init_name='color', attr_name='color')
+    schema = FieldSchema()
+    schema.append(size)
+    assert schema.exclude(['size']) == []
+
+    schema.append(color)
+    assert schema.attr_names == ('size', 'color')
+    assert schema.fingerprint == frozenset([size, color])
+    assert schema.exclude(['size']) == [color]
+    assert schema.get_values(FieldedAttrs(size=12, color='red')) == (12, 'red')
+
+    del schema[0]
+    assert schema.fields_by_attr_name == {'color': color}
+
+    assert schema.freeze() is schema
+    with pytest.raises(TypeError):
+        schema.append(size)
+    with pytest.raises(TypeError):
+        schema.exclude(['color']).append(color)
+    assert schema.attr_names == ('color',)
+
+
+def test_dict_schema_keeps_optional_names():
+    size = ClassField(init_name='size', attr_name='size')
+    color = ClassField(init_name='color', attr_name='color')
+    schema = DictFieldSchema([size, color], optional_names={'size', 'color'})
+
+    assert schema.exclude(['color']).optional_names == frozenset(['size'])
+    assert schema.project(['color']).optional_names == frozenset(['color'])
+    assert pickle.loads(pickle.dumps(schema)).optional_names == frozenset(['size', 'color'])
@@ -0,0 +1,116 @@
+import array
+from collections import namedtuple
+
+import attr
+import pytest
+
+from classical.fields.bulk import (
+    copy_many, copy_many_chunked, diff_many, fields_equal_many, from_columns, to_columns,
+)
+
+
+FieldedNT = namedtuple('FieldedNT', ('size', 'color'))
+OtherNT = namedtuple('OtherNT', ('size', 'color'))
+
+
+@attr.s
+class FieldedAttrs:
+    size = attr.ib()
+    color = attr.ib()
+
+
+def test_copy_many():
+    srcs = (FieldedNT(size=i, color='red') for i in range(3))
+    result = copy_many(srcs, FieldedAttrs)
+    assert next(result) == FieldedAttrs(size=0, color='red')
+    assert list(result) == [FieldedAttrs(size=1, color='red'), FieldedAttrs(size=2, color='red')]
+
+    assert list(copy_many([], FieldedAttrs)) == []
+
+    dicts = [{'size': 1}, {'size': 2}]
+    assert list(copy_many(dicts, FieldedAttrs, defaults={'color': 'blue'})) == [
+        FieldedAttrs(size=1, color='blue'), FieldedAttrs(size=2, color='blue'),
+    ]
+
+
+def test_copy_many_mismatch():
+    srcs = [FieldedNT(size=1, color='red'), OtherNT(size=2, color='green'), FieldedNT(size=3, color='blue')]
+
+    with pytest.raises(ValueError, match='Heterogeneous'):
+        list(copy_many(srcs, FieldedAttrs))
+
+    assert list(copy_many(srcs, FieldedAttrs, on_mismatch='skip')) == [
+        FieldedAttrs(size=1, color='red'), FieldedAttrs(size=3, color='blue'),
+    ]
+    assert list(copy_many(srcs, FieldedAttrs, on_mismatch='replan')) == [
+        FieldedAttrs(size=1, color='red'), FieldedAttrs(size=2, color='green'), FieldedAttrs(size=3, color='blue'),
+    ]
+
+    dicts = [{'size': 1, 'color': 'red'}, {'size': 2}]
+    assert list(copy_many(dicts, FieldedAttrs, on_mismatch='skip')) == [FieldedAttrs(size=1, color='red')]
+    with pytest.raises(ValueError, match=r"dict with fields \['size', 'color'\] and dict with fields \['size'\]"):
+        list(copy_many(dicts, FieldedAttrs))
+
+    # key order doesn't matter
+    dicts = [{'size': 1, 'color': 'red'}, {'color': 'blue', 'size': 2}]
+    assert list(copy_many(dicts, FieldedAttrs)) == [
+        FieldedAttrs(size=1, color='red'), FieldedAttrs(size=2, color='blue'),
+    ]
+
+    with pytest.raises(ValueError):
+        list(copy_many(srcs, FieldedAttrs, on_mismatch='ignore'))
+
+
+def test_copy_many_chunked():
+    srcs = (FieldedNT(size=i, color='red') for i in range(5))
+    chunks = list(copy_many_chunked(srcs, FieldedAttrs, chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert chunks[2] == [FieldedAttrs(size=4, color='red')]
+
+
+def test_to_columns():
+    objs = [FieldedAttrs(size=i, color='red') for i in range(3)]
+    assert to_columns(objs) == {'size': [0, 1, 2], 'color': ['red', 'red', 'red']}
+    assert to_columns(iter(objs), fields=['color'], batch_size=2) == {'color': ['red', 'red', 'red']}
+    assert to_columns([], fields=['size']) == {'size': []}
+    assert to_columns([{'size': 1.5}, {'size': 2.5}]) == {'size': [1.5, 2.5]}
+
+    columns = to_columns(objs, kind='array')
+    assert columns['size'] == array.array('q', [0, 1, 2])
+    assert columns['color'] == ['red', 'red', 'red']
+    assert to_columns([FieldedAttrs(size=1, color=2.5)], kind='array')['color'] == array.array('d', [2.5])
+
+    with pytest.raises(ValueError):
+        to_columns(objs, fields=['weight'])
+
+
+def test_from_columns():
+    columns = {'size': [1, 2], 'color': ['red', 'blue']}
+    assert list(from_columns(FieldedNT, columns)) == [FieldedNT(1, 'red'), FieldedNT(2, 'blue')]
+    assert list(from_columns(FieldedAttrs, columns)) == [FieldedAttrs(1, 'red'), FieldedAttrs(2, 'blue')]
+    assert list(from_columns(dict, columns)) == [{'size': 1, 'color': 'red'}, {'size': 2, 'color': 'blue'}]
+
+    objs = [FieldedAttrs(size=i, color='red') for i in range(3)]
+    assert list(from_columns(FieldedAttrs, to_columns(objs, kind='array'))) == objs
+
+    @attr.s
+    class PrivateAttrs:
+        _size = attr.ib()
+        color = attr.ib(default='white')
+
+    assert list(from_columns(PrivateAttrs, {'_size': [1]})) == [PrivateAttrs(size=1)]
+    assert list(from_columns(PrivateAttrs, {'size': [1]})) == [PrivateAttrs(size=1)]
+
+    with pytest.raises(ValueError, match='different lengths'):
+        from_columns(FieldedNT, {'size': [1, 2], 'color': ['red']})
+    with pytest.raises(ValueError, match='Unknown fields'):
+        from_columns(FieldedNT, {'size': [1], 'weight': [2]})
+
+
+def test_diff_many():
+    objs_a = [FieldedNT(size=1, color='red'), FieldedNT(size=2, color='red'), {'size': 3}]
+    objs_b = [FieldedAttrs(size=1, color='red'), FieldedAttrs(size=2, color='blue'), {'size': 4, 'color': 'red'}]
+
+    assert list(diff_many(objs_a, objs_b)) == [{}, {'color': ('red', 'blue')}, {'size': (3, 4)}]
+    assert list(fields_equal_many(objs_a, objs_b)) == [True, False, False]
+    assert list(fields_equal_many(objs_a, objs_b, exclude_names=('color',))) == [True, True, False]
@@ -3,8 +3,9 @@ from collections import namedtuple
 import attr
 import pytest
 
+from classical.fields.bulk import from_columns
 from classical.fields.functions import (
-    are_analogous, copy_to_class,
+    are_analogous, copy_to_class, diff, fields_equal, get_fields, get_name_dict, make_converter,
 )
 
 
@@ -25,6 +26,25 @@ def test_are_analogous():
     assert are_analogous(FieldedNT, FieldedAttrsExtended, exclude_names=('new_attr',))
 
 
+def test_are_analogous_collections():
+    FieldedNT = namedtuple('FieldedNT', ('size', 'color'))
+
+    @attr.s
+    class FieldedAttrs:
+        size = attr.ib()
+        color = attr.ib()
+
+    records = [FieldedNT(size=i, color='red') for i in range(100)]
+    records += [FieldedAttrs(size=i, color='red') for i in range(100)]
+    records += [{'size': i, 'color': 'red'} for i in range(100)]
+    assert are_analogous(*records)
+    assert not are_analogous(*records, {'size': 1})
+    assert not are_analogous({'size': 1}, *records)
+    assert are_analogous(*records, {'size': 1, 'weight': 2}, exclude_names=('color', 'weight'))
+    assert are_analogous({'size': 1}, {'size': 2})
+    assert not are_analogous({'size': 1}, {'color': 'red'})
+
+
 def test_copy_to_class():
     @attr.s
     class FieldedAttrs:
@@ -50,3 +70,151 @@ def test_copy_to_class():
     assert new_super_obj == FieldedAttrs(size=12, color='green')
     with pytest.raises(ValueError):
         copy_to_class(sub_obj, FieldedAttrs)
+
+
+def test_copy_to_class_from_dict():
+    @attr.s
+    class FieldedAttrs:
+        size = attr.ib()
+        color = attr.ib()
+
+    assert copy_to_class({'size': 1, 'color': 'red'}, FieldedAttrs) == FieldedAttrs(size=1, color='red')
+    assert copy_to_class({'size': 2}, FieldedAttrs, defaults={'color': 'blue'}) == FieldedAttrs(size=2, color='blue')
+    with pytest.raises(ValueError, match='Missing field'):
+        copy_to_class({'size': 1}, FieldedAttrs)
+
+
+def test_make_converter():
+    FieldedNT = namedtuple('FieldedNT', ('size', 'color', 'weight'))
+
+    @attr.s
+    class FieldedAttrs:
+        _size = attr.ib()
+        color = attr.ib()
+        shape = attr.ib(default='round')
+
+    with pytest.raises(ValueError, match=r"Missing field: \['_size', 'shape'\]"):
+        make_converter(FieldedNT, FieldedAttrs, ignore_extra=True)
+    with pytest.raises(ValueError, match=r"Extra fields \['size', 'weight'\]"):
+        make_converter(FieldedNT, FieldedAttrs, ignore_missing=True)
+
+    FieldedAttrsPublic = attr.make_class('FieldedAttrsPublic', ['size', 'color', 'shape'])
+    converter = make_converter(
+        FieldedNT, FieldedAttrsPublic,
+        exclude_names=('weight',), defaults={'shape': 'square'},
+    )
+    assert converter(FieldedNT(size=1, color='red', weight=2)) == FieldedAttrsPublic(
+        size=1, color='red', shape='square')
+    assert converter(FieldedNT(size=3, color='blue', weight=4)) == FieldedAttrsPublic(
+        size=3, color='blue', shape='square')
+
+
+def test_diff():
+    FieldedNT = namedtuple('FieldedNT', ('size', 'color', 'weight'))
+
+    @attr.s
+    class FieldedAttrs:
+        size = attr.ib()
+        color = attr.ib()
+        shape = attr.ib()
+
+    nt_obj = FieldedNT(size=1, color='red', weight=5)
+    attrs_obj = FieldedAttrs(size=1, color='blue', shape='round')
+
+    assert diff(nt_obj, attrs_obj) == {'color': ('red', 'blue')}
+    assert diff(nt_obj, attrs_obj, exclude_names=('color',)) == {}
+    assert diff(attrs_obj, {'size': 2, 'color': 'blue'}) == {'size': (1, 2)}
+    assert not fields_equal(nt_obj, attrs_obj)
+    assert fields_equal(nt_obj, attrs_obj, exclude_names=('color',))
+    assert fields_equal({'size': 1, 'color': 'red'}, nt_obj)
+    assert fields_equal({}, {})
+    with pytest.raises(ValueError, match='No common fields'):
+        fields_equal(nt_obj, {'shape': 'round'})
+    with pytest.raises(ValueError, match='No common fields'):
+        diff(nt_obj, attrs_obj, exclude_names=('size', 'color'))
+
+
+@attr.s
+class SrcNode:
+    value = attr.ib()
+    children = attr.ib(default=())
+
+
+@attr.s
+class DstNode:
+    value = attr.ib()
+    children = attr.ib(default=())
+
+
+ValueAttrs = attr.make_class('ValueAttrs', ['value'])
+
+
+def test_copy_to_class_nested():
+    shared = SrcNode(value='shared')
+    tree = SrcNode(value='root', children=[shared, SrcNode(value='leaf', children=(shared,)), 'text'])
+    copied = copy_to_class(tree, DstNode, class_map={SrcNode: DstNode})
+
+    assert copied == DstNode(value='root', children=[
+        DstNode(value='shared'),
+        DstNode(value='leaf', children=(DstNode(value='shared'),)),
+        'text',
+    ])
+    assert copied.children[0] is copied.children[1].children[0]
+    # containers without converted items are not copied
+    assert copied.children[0].children is shared.children
+
+    # converters can be used to set options of nested conversions
+    converter = make_converter(SrcNode, ValueAttrs, exclude_names=('children',), ignore_extra=True)
+    copied = copy_to_class(tree, DstNode, class_map={SrcNode: converter})
+    assert copied.children[0] == ValueAttrs(value='shared')
+
+
+def test_copy_to_class_nested_deep_and_cyclic():
+    head = SrcNode(value=0)
+    for i in range(1, 10000):
+        head = SrcNode(value=i, children={'next': head})
+    copied = copy_to_class(head, DstNode, class_map={SrcNode: DstNode})
+    assert copied.value == 9999
+    assert copied.children['next'].children['next'].value == 9997
+
+    cyclic = SrcNode(value='cycle', children=[])
+    cyclic.children.append(cyclic)
+    with pytest.raises(ValueError, match='cycle'):
+        copy_to_class(cyclic, DstNode, class_map={SrcNode: DstNode})
+
+
+def test_namedtuple_positional_access():
+    FieldedNT = namedtuple('FieldedNT', ('size', 'color'))
+    ReversedNT = namedtuple('ReversedNT', ('color', 'size'))
+
+    fields = get_fields(FieldedNT)
+    assert [field.index for field in fields] == [0, 1]
+    assert [field.index for field in fields.project(['color'])] == [1]
+
+    assert copy_to_class(FieldedNT(size=1, color='red'), ReversedNT) == ReversedNT(color='red', size=1)
+    assert copy_to_class(ReversedNT(color='red', size=1), FieldedNT) == FieldedNT(size=1, color='red')
+    assert diff(FieldedNT(size=1, color='red'), ReversedNT(color='blue', size=1)) == {'color': ('red', 'blue')}
+    assert get_name_dict(ReversedNT(color='red', size=1)) == {'color': 'red', 'size': 1}
+
+
+class IntPoint(namedtuple('IntPoint', ('x', 'y'))):
+    def __new__(cls, x, y):
+        return super().__new__(cls, int(x), int(y))
+
+
+def test_namedtuple_overridden_new():
+    Src = namedtuple('Src', ('x', 'y'))
+    assert copy_to_class(Src('1', '2'), IntPoint) == IntPoint(1, 2)
+    assert list(from_columns(IntPoint, {'x': ['1'], 'y': ['2']})) == [IntPoint(1, 2)]
+
+
+def test_copy_to_typed_dict():
+    TypedDict = pytest.importorskip('typing').TypedDict
+
+    PartialDict = TypedDict('PartialDict', {'size': int, 'color': str}, total=False)
+    TotalDict = TypedDict('TotalDict', {'size': int, 'color': str})
+
+    assert copy_to_class({'size': 1}, PartialDict) == {'size': 1}
+    with pytest.raises(ValueError, match='Missing field'):
+        copy_to_class({'size': 1}, TotalDict)
+    assert copy_to_class({'color': 'red', 'size': 1}, TotalDict) == {'size': 1, 'color': 'red'}
@@ -0,0 +1,193 @@
+import gc
+import subprocess
+import sys
+import types
+from collections import namedtuple
+
+import attr
+import pytest
+
+from classical.fields.base import ClassField, FieldInspector, FieldSchema
+from classical.fields.generic import INSPECTOR_REGISTRY, GenericFieldInspector, register_inspector
+
+
+def test_class_cache():
+    GenericFieldInspector.cache_clear()
+
+    @attr.s
+    class FieldedAttrs:
+        size = attr.ib()
+        color = attr.ib()
+
+    fields = GenericFieldInspector.get_fields(FieldedAttrs)
+    assert GenericFieldInspector.cache_info().misses == 1
+    assert GenericFieldInspector.cache_info().currsize == 1
+
+    assert GenericFieldInspector.get_fields(FieldedAttrs) is fields
+    assert GenericFieldInspector.get_fields(FieldedAttrs(size=1, color='red')) is fields
+    assert GenericFieldInspector.cache_info().hits == 2
+
+    GenericFieldInspector.cache_clear(FieldedAttrs)
+    assert GenericFieldInspector.cache_info().currsize == 0
+    assert GenericFieldInspector.get_fields(FieldedAttrs) is not fields
+    assert GenericFieldInspector.get_fields(FieldedAttrs) == fields
+
+    del FieldedAttrs
+    gc.collect()
+    assert GenericFieldInspector.cache_info().currsize == 0
+
+
+def test_schema_is_immutable():
+    FieldedNT = namedtuple('FieldedNT', ('size', 'color'))
+    fields = GenericFieldInspector.get_fields(FieldedNT)
+    with pytest.raises(TypeError):
+        fields.append(list(fields)[0])
+    with pytest.raises(TypeError):
+        fields.pop()
+    with pytest.raises(TypeError):
+        del fields[0]
+    assert len(fields) == 2
+
+
+def test_dict_fields_are_not_shared():
+    first = GenericFieldInspector.get_fields({'size': 1})
+    second = GenericFieldInspector.get_fields({'color': 'red'})
+    assert [f.name for f in first] == ['size']
+    assert [f.name for f in second] == ['color']
+
+    # schemas are cached by keys
+    assert GenericFieldInspector.get_fields({'size': 2}) is first
+
+
+def test_unsupported_class():
+    class Unfielded:
+        pass
+
+    with pytest.raises(TypeError):
+        GenericFieldInspector.get_fields(Unfielded)
+
+
+class MarkedFieldInspector(FieldInspector[ClassField]):
+    @classmethod
+    def _validate_cls(cls, insp_cls: type) -> None:
+        if not hasattr(insp_cls, '__marked_fields__'):
+            cls._raise_unsupported_field_class(insp_cls=insp_cls)
+
+    @classmethod
+    def _get_class_fields(cls, insp_cls: type) -> FieldSchema[ClassField]:
+        cls._validate_cls(insp_cls)
+        return FieldSchema([
+            ClassField(init_name=name, attr_name=name)
+            for name in insp_cls.__marked_fields__  # noqa
+        ])
+
+
+def test_register_lazy_inspector():
+    class Marked:
+        __marked_fields__ = ('size',)
+
+    register_inspector(__name__ + ':MarkedFieldInspector', modules=('fake_marked_orm',))
+    try:
+        # the library has not been imported, so the inspector is not loaded
+        with pytest.raises(TypeError):
+            GenericFieldInspector.get_fields(Marked)
+        assert MarkedFieldInspector not in INSPECTOR_REGISTRY
+
+        sys.modules['fake_marked_orm'] = types.ModuleType('fake_marked_orm')
+        GenericFieldInspector.cache_clear()
+        assert [f.name for f in GenericFieldInspector.get_fields(Marked)] == ['size']
+        assert MarkedFieldInspector in INSPECTOR_REGISTRY
+    finally:
+        sys.modules.pop('fake_marked_orm', None)
+        if MarkedFieldInspector in INSPECTOR_REGISTRY:
+            INSPECTOR_REGISTRY.remove(MarkedFieldInspector)
+        GenericFieldInspector.cache_clear()
+
+
+def test_optional_backends_are_not_imported_eagerly():
+    code = (
+        'import sys, classical.fields.functions as f, collections;'
+        'f.get_fields(collections.namedtuple("NT", "a"));'
+        'assert "sqlalchemy" not in sys.modules and "schematics" not in sys.modules'
+    )
+    subprocess.check_call([sys.executable, '-c', code])
+
+
+def test_backend_inspector_names_without_module_getattr():
+    # Python < 3.7 has no module ``__getattr__``, the names must still be importable
+    code = (
+        'import sys; version_info = sys.version_info; sys.version_info = (3, 6, 15);'
+        'from classical.fields.generic import SQLAlchemyModelFieldInspector, SchematicsFieldInspector;'
+        'sys.version_info = version_info;'
+        'assert SQLAlchemyModelFieldInspector.__name__ == "SQLAlchemyModelFieldInspector"'
+    )
+    subprocess.check_call([sys.executable, '-c', code])
+
+
+class PreferredFieldInspector(MarkedFieldInspector):
+    priority = 100
+
+
+def test_inspector_priority():
+    @attr.s
+    class MarkedAttrs:
+        __marked_fields__ = ('size',)
+        size = attr.ib()
+        color = attr.ib()
+
+    GenericFieldInspector.cache_clear()
+    assert GenericFieldInspector._resolve_specific_inspector_cls(MarkedAttrs).__name__ == 'AttrsFieldInspector'
+
+    register_inspector(MarkedFieldInspector)
+    register_inspector(PreferredFieldInspector)
+    try:
+        assert GenericFieldInspector._resolve_specific_inspector_cls(MarkedAttrs) is PreferredFieldInspector
+        assert [f.name for f in GenericFieldInspector.get_fields(MarkedAttrs)] == ['size']
+    finally:
+        INSPECTOR_REGISTRY.remove(MarkedFieldInspector)
+        INSPECTOR_REGISTRY.remove(PreferredFieldInspector)
+        GenericFieldInspector.cache_clear()
+
+
+def test_register_inspector_clears_cached_plans():
+    from classical.fields.functions import copy_to_class, fields_equal
+
+    @attr.s
+    class MarkedAttrs:
+        __marked_fields__ = ('size',)
+        size = attr.ib()
+        color = attr.ib()
+
+    Dst = namedtuple('Dst', ('size', 'color'))
+    src = MarkedAttrs(size=1, color='red')
+    assert copy_to_class(src, Dst, defaults={'color': 'blue'}) == Dst(1, 'red')
+    assert not fields_equal(src, Dst(1, 'blue'))
+
+    register_inspector(PreferredFieldInspector)
+    try:
+        # ``color`` is no longer a field of the source
+        assert copy_to_class(src, Dst, defaults={'color': 'blue'}) == Dst(1, 'blue')
+        assert fields_equal(src, Dst(1, 'blue'))
+    finally:
+        INSPECTOR_REGISTRY.remove(PreferredFieldInspector)
+        GenericFieldInspector.cache_clear()
+
+
+def test_lazy_inspector_priority():
+    @attr.s
+    class MarkedAttrs:
+        __marked_fields__ = ('size',)
+        size = attr.ib()
+        color = attr.ib()
+
+    GenericFieldInspector.cache_clear()
+    sys.modules['fake_marked_orm'] = types.ModuleType('fake_marked_orm')
+    register_inspector(__name__ + ':PreferredFieldInspector', modules=('fake_marked_orm',))
+    try:
+        # the lazy inspector is loaded although the attrs inspector supports the class too
+        assert GenericFieldInspector._resolve_specific_inspector_cls(MarkedAttrs) is PreferredFieldInspector
+    finally:
+        sys.modules.pop('fake_marked_orm', None)
+        if PreferredFieldInspector in INSPECTOR_REGISTRY:
+            INSPECTOR_REGISTRY.remove(PreferredFieldInspector)
+        GenericFieldInspector.cache_clear()
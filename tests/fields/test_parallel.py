@@ -0,0 +1,67 @@
+import concurrent.futures
+from collections import namedtuple
+
+import attr
+import pytest
+
+from classical.fields.parallel import copy_many_parallel
+
+
+FieldedNT = namedtuple('FieldedNT', ('size', 'color'))
+
+
+@attr.s
+class FieldedAttrs:
+    size = attr.ib()
+    color = attr.ib()
+
+
+def test_copy_many_parallel():
+    srcs = [FieldedNT(size=i, color='red') for i in range(50)]
+    expected = [FieldedAttrs(size=i, color='red') for i in range(50)]
+
+    assert list(copy_many_parallel(srcs, FieldedAttrs, workers=2, chunk_size=7, serial_threshold=10)) == expected
+
+    converted = copy_many_parallel(
+        iter(srcs), FieldedAttrs, workers=2, chunk_size=7, serial_threshold=10, ordered=False)
+    assert sorted(converted, key=lambda obj: obj.size) == expected
+
+    # small inputs are converted serially
+    assert list(copy_many_parallel(srcs, FieldedAttrs)) == expected
+
+
+def test_copy_many_parallel_executor():
+    srcs = [FieldedNT(size=i, color='red') for i in range(20)] + [{'size': 20}]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        converted = copy_many_parallel(
+            srcs, FieldedAttrs, chunk_size=5, serial_threshold=0, executor=executor,
+            on_mismatch='replan', defaults={'color': 'red'},
+        )
+        assert list(converted) == [FieldedAttrs(size=i, color='red') for i in range(21)]
+
+        with pytest.raises(ValueError, match='Missing field'):
+            list(copy_many_parallel(srcs, FieldedAttrs, serial_threshold=0, executor=executor, on_mismatch='replan'))
+
+
+@attr.s
+class ExtendedAttrs:
+    size = attr.ib()
+    color = attr.ib()
+    extra = attr.ib()
+
+
+def test_copy_many_parallel_invalid_plan():
+    srcs = [FieldedNT(size=i, color='red') for i in range(30)]
+    converted = copy_many_parallel(srcs, ExtendedAttrs, workers=2, chunk_size=7, serial_threshold=10)
+    with pytest.raises(ValueError, match=r"Missing field: \['extra'\]"):
+        list(converted)
+
+
+def test_copy_many_parallel_is_lazy():
+    def srcs():
+        yield FieldedNT(size=1, color='red')
+        raise AssertionError('consumed too early')
+
+    copy_many_parallel(srcs(), FieldedAttrs)
+    with pytest.raises(ValueError):
+        copy_many_parallel(srcs(), FieldedAttrs, on_mismatch='ignore')
@@ -0,0 +1,129 @@
+from collections import namedtuple
+
+import attr
+import pytest
+import sqlalchemy
+import sqlalchemy.orm
+
+from classical.fields.functions import copy_to_class
+from classical.fields.generic import INSPECTOR_REGISTRY, GenericFieldInspector, register_inspector
+from classical.fields.sqlalchemy import SQLAlchemyModelFieldInspector, make_row_converter
+
+try:
+    from sqlalchemy.orm import declarative_base
+except ImportError:
+    # SQLAlchemy < 1.4
+    from sqlalchemy.ext.declarative import declarative_base
+
+
+Base = declarative_base()
+
+
+class Author(Base):
+    __tablename__ = 'author'
+
+    id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    name = sqlalchemy.Column(sqlalchemy.String)
+    bio = sqlalchemy.orm.deferred(sqlalchemy.Column(sqlalchemy.Text))
+    books = sqlalchemy.orm.relationship('Book')
+
+
+class Book(Base):
+    __tablename__ = 'book'
+
+    id = sqlalchemy.Column(sqlalchemy.Integer, primary_key=True)
+    author_id = sqlalchemy.Column(sqlalchemy.Integer, sqlalchemy.ForeignKey('author.id'))
+    title = sqlalchemy.Column(sqlalchemy.String)
+
+
+@attr.s
+class AuthorDTO:
+    id = attr.ib()
+    name = attr.ib()
+    bio = attr.ib(default=None)
+
+
+@pytest.fixture
+def session():
+    engine = sqlalchemy.create_engine('sqlite://')
+    Base.metadata.create_all(engine)
+    with sqlalchemy.orm.Session(engine) as session:
+        session.add(Author(id=1, name='Ann', bio='...', books=[Book(id=1, title='First')]))
+        session.commit()
+        session.expunge_all()
+
+        queries = []
+        sqlalchemy.event.listen(engine, 'before_cursor_execute', lambda *args: queries.append(args[2]))
+        session.info['queries'] = queries
+        yield session
+
+
+def test_columns_only():
+    inspector = SQLAlchemyModelFieldInspector.with_options(columns_only=True)
+    assert [f.name for f in inspector.get_fields(Author)] == ['id', 'name', 'bio']
+    assert [f.name for f in SQLAlchemyModelFieldInspector.get_fields(Author)] == ['books', 'id', 'name', 'bio']
+    assert inspector.get_fields(Author) is inspector.get_fields(Author)
+
+    with pytest.raises(ValueError):
+        SQLAlchemyModelFieldInspector.with_options(lazy_load='never')
+
+
+def test_skip_unloaded(session):
+    inspector = SQLAlchemyModelFieldInspector.with_options(lazy_load='skip')
+    author = session.get(Author, 1)
+    queries = session.info['queries']
+    del queries[:]
+
+    assert inspector.get_name_dict(author) == {'id': 1, 'name': 'Ann'}
+    assert not queries
+
+    # transient objects have nothing to load
+    assert inspector.get_name_dict(Author(id=2, name='Bob')) == {'id': 2, 'name': 'Bob', 'bio': None, 'books': []}
+
+
+def test_raise_on_unloaded(session):
+    inspector = SQLAlchemyModelFieldInspector.with_options(columns_only=True, lazy_load='raise')
+    author = session.get(Author, 1)
+    with pytest.raises(ValueError, match=r"Unloaded fields: \['bio'\]"):
+        inspector.get_name_dict(author)
+
+    register_inspector(inspector)
+    try:
+        GenericFieldInspector.cache_clear()
+        queries = session.info['queries']
+        del queries[:]
+        assert copy_to_class(author, AuthorDTO, exclude_names=('bio',)) == AuthorDTO(id=1, name='Ann')
+        assert not queries
+    finally:
+        INSPECTOR_REGISTRY.remove(inspector)
+        GenericFieldInspector.cache_clear()
+
+
+def test_row_converter(session):
+    converter = make_row_converter(Author, AuthorDTO, exclude_names=('bio',))
+    assert 'bio' not in str(converter.statement)
+    assert list(converter.stream(session)) == [AuthorDTO(id=1, name='Ann')]
+    AuthorNT = namedtuple('AuthorNT', ('id', 'name'))
+    assert list(make_row_converter(Author, AuthorNT).stream(session)) == [AuthorNT(id=1, name='Ann')]
+
+    session.add(Author(id=2, name='Bob'))
+    session.flush()
+    statement = converter.statement.where(Author.id > 1)
+    assert list(converter.stream(session, statement, batch_size=1)) == [AuthorDTO(id=2, name='Bob')]
+
+    NameDTO = attr.make_class('NameDTO', ['name', 'books', 'rank'])
+    with pytest.raises(ValueError, match=r"Missing field: \['books', 'rank'\]"):
+        make_row_converter(Author, NameDTO)
+    converter = make_row_converter(Author, NameDTO, ignore_missing=True, defaults={'books': [], 'rank': 1})
+    assert str(converter.statement).split('FROM')[0].strip() == 'SELECT author.name'
+    assert converter(('Ann',)) == NameDTO(name='Ann', books=[], rank=1)
+
+
+def test_row_converter_optional_fields():
+    TypedDict = pytest.importorskip('typing').TypedDict
+    PartialAuthor = TypedDict('PartialAuthor', {'name': str, 'rank': int}, total=False)
+
+    # same as ``copy_to_class``, optional fields are not missing
+    converter = make_row_converter(Author, PartialAuthor)
+    assert converter(('Ann',)) == {'name': 'Ann'}
+    assert copy_to_class({'name': 'Ann'}, PartialAuthor) == {'name': 'Ann'}
@@ -0,0 +1,52 @@
+import os
+import tempfile
+
+from classical.bench import BenchmarkResult, compare_results, load_results, measure, run_benchmarks, save_results
+from classical.bench.__main__ import main
+
+
+def test_run_benchmarks():
+    results = run_benchmarks(pattern=r'get_fields\.(attrs|dict)$', number=10, repeat=1)
+    assert sorted(results) == ['fields.get_fields.attrs', 'fields.get_fields.dict']
+    assert all(result.ops_per_sec > 0 for result in results.values())
+
+
+def test_measure_allocations():
+    # temporary objects are counted even though nothing is retained
+    result = measure(lambda: len([0] * 1000), number=10, repeat=1)
+    assert result.allocated_bytes_per_op >= 8000
+    assert result.retained_bytes_per_op < 100
+
+
+def test_compare_results():
+    baseline = {
+        'fast': BenchmarkResult(ops_per_sec=1000, peak_bytes=10000, retained_bytes_per_op=0),
+        'slow': BenchmarkResult(ops_per_sec=1000, peak_bytes=10000, retained_bytes_per_op=0),
+    }
+    results = {
+        'fast': BenchmarkResult(ops_per_sec=950, peak_bytes=10500, retained_bytes_per_op=0),
+        'slow': BenchmarkResult(ops_per_sec=800, peak_bytes=20000, retained_bytes_per_op=0),
+        'new': BenchmarkResult(ops_per_sec=1, peak_bytes=1, retained_bytes_per_op=1),
+    }
+    regressions = compare_results(results, baseline, threshold=0.1)
+    assert [(r.name, r.metric) for r in regressions] == [('slow', 'ops_per_sec'), ('slow', 'peak_bytes')]
+
+    # per-operation allocations
+    baseline['fast'] = baseline['fast']._replace(allocated_bytes_per_op=200)
+    results['fast'] = results['fast']._replace(allocated_bytes_per_op=300)
+    regressions = compare_results(results, baseline, threshold=0.1)
+    assert ('fast', 'allocated_bytes_per_op') in [(r.name, r.metric) for r in regressions]
+    assert compare_results(results, baseline, threshold=1.0) == []
+
+
+def test_save_and_compare():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'results.json')
+        assert main(['-k', r'get_fields\.attrs$', '-n', '10', '-r', '1', '-o', path]) == 0
+        saved = load_results(path)
+        assert list(saved) == ['fields.get_fields.attrs']
+
+        # an unreachable baseline makes the run fail
+        saved['fields.get_fields.attrs'] = saved['fields.get_fields.attrs']._replace(ops_per_sec=float('1e15'))
+        save_results(saved, path)
+        assert main(['-k', r'get_fields\.attrs$', '-n', '10', '-r', '1', '-b', path]) == 1
@@ -1,11 +1,29 @@
+import gc
+import pickle
+import threading
+import time
+import weakref
 from unittest import TestCase
 
 from classical.descriptors import (
     ArgumentedSubclass, AttributedSubclass,
-    AutoProperty, DummySubclass
+    AutoProperty, DummySubclass, FactoryProperty
 )
 
 
+class PicklableThing:
+    size = None
+
+    Red = ArgumentedSubclass(color='red')
+    Large = AttributedSubclass(size='large')
+    Copy = DummySubclass()
+    book = AutoProperty(has='pages')
+
+    def __init__(self, color=None, has=None):
+        self.color = color
+        self.has = has
+
+
 class TestDescriptors(TestCase):
     def test_argumented_subclass(self):
         class Tree:
@@ -146,3 +164,135 @@ class TestDescriptors(TestCase):
         self.assertIs(ClassyThing.my_instance.__class__, ClassyThing)
         self.assertNotIsInstance(ClassyThing.my_terminal_instance, ClassyThing)
         self.assertIs(ClassyThing.my_terminal_instance.__class__, Thing)
+
+    def test_owners_are_not_kept_alive(self):
+        class Thing:
+            Red = ArgumentedSubclass(color='red')
+            book = AutoProperty(has='pages')
+
+            def __init__(self, color=None, has=None):
+                self.color = color
+                self.has = has
+
+        red_prop = Thing.__dict__['Red']
+        book_prop = Thing.__dict__['book']
+
+        TenantThing = type('TenantThing', (Thing,), {})
+        self.assertTrue(issubclass(TenantThing.Red, TenantThing))
+        self.assertIsInstance(TenantThing.book, TenantThing)
+        self.assertEqual(1, red_prop.cache_size)
+        self.assertEqual(1, book_prop.cache_size)
+
+        tenant_ref = weakref.ref(TenantThing)
+        del TenantThing
+        gc.collect()
+        self.assertIsNone(tenant_ref())
+        self.assertEqual(0, red_prop.cache_size)
+        self.assertEqual(0, book_prop.cache_size)
+
+    def test_invalidate_and_clear(self):
+        class Thing:
+            Red = ArgumentedSubclass(color='red')
+
+            def __init__(self, color=None):
+                self.color = color
+
+        class ClassyThing(Thing):
+            pass
+
+        red_prop = Thing.__dict__['Red']
+        red = Thing.Red
+        classy_red = ClassyThing.Red
+        self.assertEqual(2, red_prop.cache_size)
+
+        red_prop.invalidate(Thing)
+        self.assertEqual(1, red_prop.cache_size)
+        self.assertIsNot(red, Thing.Red)
+        self.assertIs(classy_red, ClassyThing.Red)
+
+        red_prop.clear()
+        self.assertEqual(0, red_prop.cache_size)
+        self.assertIsNot(classy_red, ClassyThing.Red)
+
+    def test_limited_property(self):
+        class Thing:
+            lru_book = AutoProperty().limited(2)
+            fifo_book = AutoProperty().limited(2, eviction='fifo')
+
+        subclasses = [type('Thing{}'.format(i), (Thing,), {}) for i in range(3)]
+        lru_books = [subclass.lru_book for subclass in subclasses[:2]]
+        fifo_books = [subclass.fifo_book for subclass in subclasses[:2]]
+        self.assertIs(lru_books[0], subclasses[0].lru_book)
+        self.assertIs(fifo_books[0], subclasses[0].fifo_book)
+
+        # evicts the least recently used / the oldest owner
+        self.assertIsInstance(subclasses[2].lru_book, subclasses[2])
+        self.assertIsInstance(subclasses[2].fifo_book, subclasses[2])
+        self.assertEqual(2, Thing.__dict__['lru_book'].cache_size)
+        self.assertIs(lru_books[0], subclasses[0].lru_book)
+        self.assertIsNot(lru_books[1], subclasses[1].lru_book)
+        self.assertIsNot(fifo_books[0], subclasses[0].fifo_book)
+
+    def test_concurrent_access(self):
+        thread_count = 32
+        factory_calls = []
+
+        def slow_factory(cls, name, **kwargs):
+            factory_calls.append((cls, name))
+            time.sleep(0.01)
+            return cls(**kwargs)
+
+        class Thing:
+            book = FactoryProperty(slow_factory, has='pages')
+            Red = ArgumentedSubclass(color='red')
+
+            def __init__(self, color=None, has=None):
+                self.color = color
+                self.has = has
+
+        class ClassyThing(Thing):
+            pass
+
+        barrier = threading.Barrier(thread_count)
+        results = []
+
+        def access(owner):
+            barrier.wait()
+            results.append((owner, owner.book, owner.Red))
+
+        threads = [
+            threading.Thread(target=access, args=(Thing if i % 2 else ClassyThing,))
+            for i in range(thread_count)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(thread_count, len(results))
+        self.assertEqual(2, len(factory_calls))
+        for owner, book, red in results:
+            self.assertIs(owner.book, book)
+            self.assertIs(owner.Red, red)
+            self.assertIs(type(book), owner)
+
+    def test_pickling(self):
+        for subclass in (
+                PicklableThing.Red, PicklableThing.Red.Large,
+                PicklableThing.Large.Copy.Red, PicklableThing.Copy.Red.Large,
+        ):
+            self.assertIs(subclass, pickle.loads(pickle.dumps(subclass)))
+            inst = pickle.loads(pickle.dumps(subclass(has='light')))
+            self.assertIs(subclass, type(inst))
+            self.assertEqual('light', inst.has)
+
+        self.assertEqual('PicklableThing.Red.Large', PicklableThing.Red.Large.__qualname__)
+        self.assertEqual(__name__, PicklableThing.Red.Large.__module__)
+
+        book = pickle.loads(pickle.dumps(PicklableThing.Red.book))
+        self.assertIs(PicklableThing.Red, type(book))
+        self.assertEqual(('red', 'pages'), (book.color, book.has))
+        # instances are pickled by value, so identity is not preserved
+        self.assertIsNot(PicklableThing.Red.book, book)
+        owner, name = pickle.loads(pickle.dumps((PicklableThing.Red, 'book')))
+        self.assertIs(PicklableThing.Red.book, getattr(owner, name))
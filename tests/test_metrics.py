@@ -0,0 +1,76 @@
+from unittest import TestCase
+
+import attr
+
+from classical import metrics
+from classical.descriptors import AutoProperty
+from classical.fields.functions import copy_to_class
+
+
+class TestMetrics(TestCase):
+    def setUp(self) -> None:
+        metrics.reset()
+        metrics.enable()
+
+    def tearDown(self) -> None:
+        metrics.disable()
+        metrics.reset()
+
+    def test_metrics(self):
+        events = []
+
+        def callback(name, count, duration):
+            events.append(name)
+
+        metrics.add_callback(callback)
+        self.addCleanup(metrics.remove_callback, callback)
+
+        @attr.s
+        class FieldedAttrs:
+            size = attr.ib()
+
+        class Thing:
+            book = AutoProperty()
+
+        copy_to_class({'size': 1}, FieldedAttrs)
+        copy_to_class({'size': 2}, FieldedAttrs)
+        Thing.book  # noqa
+        Thing.book  # noqa
+
+        snapshot = metrics.snapshot()
+        self.assertEqual(2, snapshot['fields.copy_to_class']['count'])
+        self.assertGreater(snapshot['fields.copy_to_class']['total_time'], 0)
+        self.assertEqual(1, snapshot['fields.converter.build']['count'])
+        self.assertEqual(1, snapshot['fields.schema.build']['count'])
+        self.assertEqual(1, snapshot['descriptors.factory']['count'])
+        self.assertEqual(1, snapshot['descriptors.cache.miss']['count'])
+        self.assertEqual(1, snapshot['descriptors.cache.hit']['count'])
+        self.assertIn('fields.inspector.resolve', snapshot)
+        self.assertIn('descriptors.factory', events)
+
+    def test_disabled(self):
+        metrics.disable()
+
+        class Thing:
+            book = AutoProperty()
+
+        Thing.book  # noqa
+        self.assertEqual({}, metrics.snapshot())
+
+    def test_callback_errors(self):
+        snapshots = []
+
+        def failing_callback(name, count, duration):
+            raise RuntimeError(name)
+
+        def snapshot_callback(name, count, duration):
+            snapshots.append(metrics.snapshot())
+
+        metrics.add_callback(failing_callback)
+        self.addCleanup(metrics.remove_callback, failing_callback)
+        metrics.add_callback(snapshot_callback)
+        self.addCleanup(metrics.remove_callback, snapshot_callback)
+
+        with self.assertLogs('classical.metrics', level='ERROR'):
+            metrics.record('event')
+        self.assertEqual([{'event': {'count': 1, 'total_time': 0.0}}], snapshots)
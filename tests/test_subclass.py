@@ -1,6 +1,18 @@
+import pickle
 from unittest import TestCase
 
-from classical.subclass import argumented_subclass, attributed_subclass
+from classical.subclass import SubclassCache, argumented_subclass, attributed_subclass
+
+
+class PicklableBase:
+    color = None
+
+    def __init__(self, size=None):
+        self.size = size
+
+
+PicklableArgumented = argumented_subclass(PicklableBase, 'PicklableArgumented', 5)
+PicklableAttributed = attributed_subclass(PicklableBase, 'PicklableAttributed', color='red')
 
 
 class TestArgumentedSubclass(TestCase):
@@ -41,6 +53,36 @@ class TestArgumentedSubclass(TestCase):
         self.assertTrue(Subclass.class_works())
         self.assertTrue(Subclass.static_works())
 
+    def test_argumented_subclass_chain(self):
+        class Base:
+            def __init__(self, *args, **kwargs):
+                self.args = args
+                self.kwargs = kwargs
+
+        Level1 = argumented_subclass(Base, 'Level1', 1, a='level1', b='level1')
+        Level2 = argumented_subclass(Level1, 'Level2', 2, b='level2')
+
+        class Custom(Level2):
+            pass
+
+        Level3 = argumented_subclass(Custom, 'Level3', c='level3')
+
+        inst = Level3(3, a='call')
+        self.assertEqual((1, 2, 3), inst.args)
+        self.assertEqual({'a': 'call', 'b': 'level2', 'c': 'level3'}, inst.kwargs)
+        self.assertIsInstance(inst, Level2)
+        self.assertIsInstance(inst, Custom)
+        self.assertEqual((1, 2), Level2().args)
+        self.assertEqual({'a': 'level1', 'b': 'level2'}, Level2().kwargs)
+
+        class Overridden(Level1):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, overridden=True, **kwargs)
+
+        inst = argumented_subclass(Overridden, 'Level2', 2)()
+        self.assertEqual((1, 2), inst.args)
+        self.assertEqual({'a': 'level1', 'b': 'level1', 'overridden': True}, inst.kwargs)
+
     def test_slots(self):
         class BaseWSlots:
             __slots__ = ('qwerty',)
@@ -132,3 +174,58 @@ class TestAttributedSubclass(TestCase):
         Subclass = attributed_subclass(BaseNoSlots, 'Subclass', qwerty=5)
         self.assertTrue(hasattr(Subclass(), '__dict__'))
         self.assertFalse(hasattr(Subclass(), '__slots__'))
+
+
+class TestPickling(TestCase):
+    def test_pickling(self):
+        for subclass in (PicklableArgumented, PicklableAttributed):
+            self.assertEqual(__name__, subclass.__module__)
+            self.assertIs(subclass, pickle.loads(pickle.dumps(subclass)))
+
+        inst = pickle.loads(pickle.dumps(PicklableArgumented()))
+        self.assertIs(PicklableArgumented, type(inst))
+        self.assertEqual(5, inst.size)
+
+
+class TestSubclassCache(TestCase):
+    def test_interning(self):
+        class Base:
+            color = None
+
+            def __init__(self, size=None, color=None):
+                self.size = size
+                self.color = color
+
+        cache = SubclassCache(maxsize=2)
+        Red = cache.argumented_subclass(Base, 'Red', color='red')
+        self.assertIs(Red, cache.argumented_subclass(Base, 'Red', color='red'))
+        self.assertEqual('red', Red().color)
+        self.assertIsNot(Red, cache.argumented_subclass(Base, 'Red', color='blue'))
+        self.assertIsNot(cache.argumented_subclass(Base, 'One', 1), cache.argumented_subclass(Base, 'One', True))
+        self.assertEqual((1, 4, 2, 2), tuple(cache.cache_info()))
+
+        # least recently used subclasses are evicted
+        self.assertIsNot(Red, cache.argumented_subclass(Base, 'Red', color='red'))
+
+        Blue = cache.attributed_subclass(Base, 'Blue', color='blue')
+        self.assertIs(Blue, cache.attributed_subclass(Base, 'Blue', color='blue'))
+        self.assertEqual('blue', Blue.color)
+
+        # unhashable arguments are not interned
+        self.assertIsNot(
+            cache.argumented_subclass(Base, 'Sized', size=[1]),
+            cache.argumented_subclass(Base, 'Sized', size=[1]),
+        )
+
+        cache.cache_clear()
+        self.assertEqual((0, 0, 2, 0), tuple(cache.cache_info()))
+
+        # equal keyword values of different types give different subclasses
+        cache = SubclassCache()
+        Flagged = cache.argumented_subclass(Base, 'Flagged', size=1)
+        self.assertIsNot(Flagged, cache.argumented_subclass(Base, 'Flagged', size=True))
+        self.assertIs(True, cache.argumented_subclass(Base, 'Flagged', size=True)().size)
+        self.assertIsNot(
+            cache.attributed_subclass(Base, 'Weighted', weight=1),
+            cache.attributed_subclass(Base, 'Weighted', weight=1.0),
+        )